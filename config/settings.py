@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 256
 
     # Redis Cache
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -48,6 +50,11 @@ class Settings(BaseSettings):
     # MCP Settings
     MCP_VERSION: str = "1.0"
     MCP_ENABLED: bool = True
+    MCP_REDIS_CACHE_ENABLED: bool = os.getenv("MCP_REDIS_CACHE_ENABLED", "false").lower() == "true"
+    MCP_REDIS_CACHE_TTL: int = 300  # seconds
+    MCP_BATCHING_ENABLED: bool = os.getenv("MCP_BATCHING_ENABLED", "false").lower() == "true"
+    MCP_BATCH_MAX_SIZE: int = 64
+    MCP_BATCH_MAX_WAIT_MS: int = 3
     
     # Monitoring
     PROMETHEUS_METRICS: bool = True
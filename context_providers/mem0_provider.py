@@ -15,6 +15,7 @@ from fastapi import APIRouter, HTTPException, Query, Body, Depends, Request
 from typing import List, Optional, Dict, Any
 from mem0 import Memory
 import asyncio
+import httpx
 from datetime import datetime, timedelta
 
 # Configure logging
@@ -25,6 +26,15 @@ router = APIRouter(prefix="/api/context/mem0", tags=["context", "mem0"])
 # Global mem0 client
 _mem0_client = None
 
+# Shared HTTP client for mem0, owned by the application lifespan
+_mem0_http_client: Optional[httpx.AsyncClient] = None
+
+def set_mem0_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Use the given HTTP client for mem0 calls, rebuilding the mem0 client on next use"""
+    global _mem0_client, _mem0_http_client
+    _mem0_http_client = client
+    _mem0_client = None
+
 def get_mem0_client():
     """Get or create the mem0 client with proper configuration"""
     global _mem0_client
@@ -40,7 +50,8 @@ def get_mem0_client():
             _mem0_client = Memory(
                 api_key=api_key, 
                 base_url=base_url,
-                collection=collection
+                collection=collection,
+                client=_mem0_http_client
             )
             logger.info("mem0 client initialized successfully")
         except Exception as e:
@@ -62,7 +73,7 @@ mem0_client = get_mem0_client
 async def get_memories(user_id: str = Query(...)):
     """Retrieve memories for a user from mem0"""
     try:
-        memories = mem0_client.get_memories(user_id=user_id)
+        memories = await get_mem0_client().get_memories(user_id=user_id)
         return {"user_id": user_id, "memories": memories}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -71,7 +82,7 @@ async def get_memories(user_id: str = Query(...)):
 async def add_memory(user_id: str = Query(...), content: str = Query(...)):
     """Add a memory for a user in mem0"""
     try:
-        mem0_client.add_memory(user_id=user_id, content=content)
+        await get_mem0_client().add_memory(user_id=user_id, content=content)
         return {"status": "success"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -81,7 +92,7 @@ async def add_mem0_memory(user_id: str = Body(...), content: str = Body(...)):
     """Add a memory for a user in mem0 (shared client)"""
     try:
         client = get_mem0_client()
-        result = client.add_memory(user_id=user_id, content=content)
+        result = await client.add_memory(user_id=user_id, content=content)
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -91,7 +102,7 @@ async def update_mem0_memory(user_id: str = Body(...), memory_id: str = Body(...
     """Update a memory for a user in mem0 (shared client)"""
     try:
         client = get_mem0_client()
-        result = client.update_memory(user_id=user_id, memory_id=memory_id, content=content)
+        result = await client.update_memory(user_id=user_id, memory_id=memory_id, content=content)
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -101,7 +112,7 @@ async def search_mem0_memory(user_id: str, query: str):
     """Search memories for a user in mem0 (shared client)"""
     try:
         client = get_mem0_client()
-        results = client.search_memories(user_id=user_id, query=query)
+        results = await client.search_memories(user_id=user_id, query=query)
         return {"results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -111,7 +122,7 @@ async def clear_mem0_memory(user_id: str):
     """Clear all memories for a user in mem0 (shared client)"""
     try:
         client = get_mem0_client()
-        result = client.clear_memories(user_id=user_id)
+        result = await client.clear_memories(user_id=user_id)
         return {"result": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"mem0 error: {str(e)}")
@@ -145,6 +156,29 @@ class ContextProvider:
             
             return context["data"]
     
+    async def mstore(self, contexts: Dict[str, Dict[str, Any]]) -> None:
+        """Store several contexts under a single lock acquisition"""
+        async with self._lock:
+            expires_at = datetime.now() + timedelta(seconds=self._ttl_seconds)
+            for context_id, context_data in contexts.items():
+                self._storage[context_id] = {
+                    "data": context_data,
+                    "expires_at": expires_at
+                }
+    
+    async def mget(self, context_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Retrieve several contexts under a single lock acquisition"""
+        async with self._lock:
+            now = datetime.now()
+            results = {}
+            for context_id in context_ids:
+                context = self._storage.get(context_id)
+                if context and now > context["expires_at"]:
+                    del self._storage[context_id]
+                    context = None
+                results[context_id] = context["data"] if context else None
+            return results
+    
     async def update(self, context_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update existing context"""
         async with self._lock:
@@ -6,7 +6,7 @@ import logging.handlers
 import os
 import json
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 class JSONFormatter(logging.Formatter):
     """
@@ -91,6 +91,29 @@ def get_logger(name: str) -> logging.Logger:
     """
     return logging.getLogger(name)
 
+def log_context(
+    message: str,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    level: int = logging.INFO
+) -> None:
+    """
+    Log a message with user, session and request context.
+    
+    The context is attached as extra fields, which JSONFormatter merges
+    into the structured log line.
+    
+    Args:
+        message: Log message
+        user_id: ID of the user making the request
+        session_id: Client session ID
+        request_id: Unique request identifier
+        level: Logging level
+    """
+    context = {"user_id": user_id, "session_id": session_id, "request_id": request_id}
+    get_logger("api.request").log(level, message, extra={"extra": context})
+
 class LoggerAdapter(logging.LoggerAdapter):
     """
     Custom logger adapter that adds context to log messages.
@@ -3,13 +3,15 @@ Database connection management.
 
 Provides optimized database connection pooling and session management.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 from contextlib import contextmanager
 
+import orjson
 import os
 import sys
 
@@ -18,6 +20,10 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from config.settings import settings
 
+def _json_serializer(value) -> str:
+    """Serialize JSON column values with orjson (drivers expect str)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 # Create SQLAlchemy engine with connection pooling
 engine = create_engine(
     settings.DATABASE_URL,
@@ -27,7 +33,9 @@ engine = create_engine(
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_pre_ping=True,  # Verify connections before using them
     pool_recycle=3600,   # Recycle connections after 1 hour
-    echo=settings.ENVIRONMENT == "development"  # SQL logging in development
+    echo=settings.ENVIRONMENT == "development",  # SQL logging in development
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create session factory
@@ -37,6 +45,36 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine for handlers running on the event loop (e.g. WebSockets),
+# so a connection is only checked out for the duration of a query. It uses
+# asyncpg, so it is only built when DATABASE_URL points at PostgreSQL.
+_database_url = make_url(settings.DATABASE_URL)
+async_engine = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+if _database_url.get_backend_name() == "postgresql":
+    async_engine = create_async_engine(
+        _database_url.set(drivername="postgresql+asyncpg"),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=False,  # Skip the extra round-trip per checkout; recycling handles stale connections
+        pool_recycle=3600,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+        connect_args={
+            # Keep prepared statements per connection so repeated queries skip PREPARE
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        },
+    )
+    
+    # Create async session factory
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        expire_on_commit=False
+    )
+
 # Base class for all models
 Base = declarative_base()
 
@@ -57,6 +95,35 @@ def get_db_session() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session from the connection pool.
+    
+    Yields:
+        Async database session
+        
+    Note:
+        This function is designed to be used as a FastAPI dependency in
+        async handlers. The session is closed, returning its connection
+        to the pool, when the request is complete.
+    
+    Raises:
+        RuntimeError: If DATABASE_URL is not a PostgreSQL URL
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database sessions require a PostgreSQL DATABASE_URL")
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async def warm_async_pool() -> None:
+    """
+    Open a pooled async connection ahead of the first request.
+    """
+    if async_engine is None:
+        return
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
 @contextmanager
 def db_session():
     """
@@ -134,7 +134,7 @@ MAX_RETRIES=3
 RETRY_COUNT=0
 
 while [ $RETRY_COUNT -lt $MAX_RETRIES ]; do
-    MCP_HEALTH_CHECK=$(docker-compose exec -T api curl -s http://localhost:8000/api/mcp/health)
+    MCP_HEALTH_CHECK=$(docker-compose exec -T api curl -s http://localhost:8000/api/mcp/health/deep)
     if echo "$MCP_HEALTH_CHECK" | grep -q "healthy"; then
         echo -e "${GREEN}MCP adapter is healthy.${NC}"
         break
@@ -5,6 +5,8 @@ from fastapi import APIRouter, HTTPException, Body, Depends
 from typing import Optional
 import httpx
 import os
+import time
+import random
 import asyncio
 from functools import lru_cache
 from api.security import get_current_user
@@ -18,18 +20,28 @@ _invitation_cache = {}
 _INVITATION_CACHE_TTL = 300  # seconds
 
 def _cache_set(key, value):
-    _invitation_cache[key] = (value, asyncio.get_event_loop().time())
+    _invitation_cache[key] = (value, time.monotonic())
 
 def _cache_get(key):
     val = _invitation_cache.get(key)
     if val:
         value, ts = val
-        if asyncio.get_event_loop().time() - ts < _INVITATION_CACHE_TTL:
+        if time.monotonic() - ts < _INVITATION_CACHE_TTL:
             return value
         else:
             _invitation_cache.pop(key, None)
     return None
 
+# Full-jitter exponential backoff between MIS retries
+_RETRY_BASE_DELAY = 0.25  # seconds
+_RETRY_MAX_DELAY = 2.0  # seconds
+
+def _is_retryable(exc):
+    """Only network failures and 5xx responses are worth retrying."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
 async def _httpx_post_with_retry(url, json, retries=2, timeout=5):
     for attempt in range(retries + 1):
         try:
@@ -38,9 +50,10 @@ async def _httpx_post_with_retry(url, json, retries=2, timeout=5):
                 resp.raise_for_status()
                 return resp.json()
         except httpx.HTTPError as e:
-            if attempt == retries:
+            if attempt == retries or not _is_retryable(e):
                 raise HTTPException(status_code=502, detail=f"MIS backend error: {str(e)}")
-            await asyncio.sleep(0.5 * (attempt + 1))
+            cap = min(_RETRY_MAX_DELAY, timeout)
+            await asyncio.sleep(min(cap, random.uniform(0, _RETRY_BASE_DELAY * (2 ** attempt))))
 
 @router.post("/validate-invitation")
 async def validate_invitation(
@@ -2,25 +2,29 @@
 API Gateway for routing, authentication, context, event-driven integration, and real-time WebSocket support.
 Production-optimized: structured logging, error handling, OpenAPI docs, configuration management, and rate limiting.
 """
-from fastapi import APIRouter, Request, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Cookie
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, Request, Response, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Cookie
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from core.logging import log_context
-from api.security import get_current_user
-from api.models import BaseResponse, ErrorResponse
+from security import get_current_user, validate_ws_token, get_ws_user
+from database.connection import db_session, AsyncSessionLocal
+from typing import Optional
 import time
+import json
 import asyncio
 import uuid
 from functools import wraps
+from dataclasses import dataclass
 from core.enhanced_event_bus import EventBus
 import jwt
 import os
 import redis
-from config.configuration import config
+import redis.asyncio as aioredis
+from config.settings import settings
 import logging
 from fastapi.openapi.utils import get_openapi
 from starlette.websockets import WebSocketState
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Structured logging setup
 logger = logging.getLogger("api.gateway")
@@ -32,36 +36,43 @@ RATE_LIMITS = {
     "guest": 20
 }
 
+RATE_LIMIT_WINDOW_MS = 60000
+
+# Sliding-window counter: a ZSET of request timestamps per user/role.
+# Returns {allowed, count, oldest_timestamp_ms}.
+SLIDING_WINDOW_LUA = """
+local k = KEYS[1]
+local now = tonumber(ARGV[1])
+local win = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', k, 0, now - win)
+local c = redis.call('ZCARD', k)
+if c < tonumber(ARGV[3]) then
+    redis.call('ZADD', k, now, ARGV[4])
+    redis.call('PEXPIRE', k, win)
+    return {1, c + 1, 0}
+end
+local oldest = redis.call('ZRANGE', k, 0, 0, 'WITHSCORES')
+return {0, c, tonumber(oldest[2])}
+"""
+
 def rate_limiter(user_id: str, role: str):
-    now = int(time.time() / 60)
-    key = f"ratelimit:{role}:{user_id}:{now}"
+    now_ms = int(time.time() * 1000)
+    key = f"ratelimit:{role}:{user_id}"
     limit = RATE_LIMITS.get(role, 20)
-    count = redis_client.get(key)
-    if count is None:
-        redis_client.set(key, 1, ex=60)
-        count = 1
-    else:
-        count = int(count) + 1
-        redis_client.set(key, count, ex=60)
-    if count > limit:
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
-    return limit, count
-
-def api_response(data=None, message="", status_code=200):
-    return JSONResponse(
-        status_code=status_code,
-        content={
-            "status": "success" if status_code < 400 else "error",
-            "data": data,
-            "message": message,
-            "errors": [] if status_code < 400 else [message],
-        },
+    allowed, count, oldest_ms = sliding_window_script(
+        keys=[key],
+        args=[now_ms, RATE_LIMIT_WINDOW_MS, limit, f"{now_ms}-{uuid.uuid4().hex}"],
     )
+    if not allowed:
+        retry_after = max(1, -(-(oldest_ms + RATE_LIMIT_WINDOW_MS - now_ms) // 1000))
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(retry_after)},
+        )
+    return limit, count
 
 # --- Error Handling Middleware ---
-from fastapi import FastAPI
-from fastapi.responses import PlainTextResponse
-
 # Example: global exception handler for improved error context
 app = FastAPI()
 
@@ -105,7 +116,7 @@ def route_request(path: str, method: str, data=None, user=None):
 
 # Centralized request entry point with auth and rate limiting
 @router.api_route(f"/api/{API_VERSION}/gateway/{{path:path}}", methods=["GET", "POST", "PUT", "DELETE"], tags=["gateway"], summary="Centralized API Gateway Endpoint", response_description="Routed API response")
-def gateway(request: Request, user=Depends(get_current_user)):
+def gateway(request: Request, response: Response, user=Depends(get_current_user)):
     """Centralized API gateway endpoint with authentication, rate limiting, and routing."""
     user_id = user.get("user_id", "anonymous")
     role = user.get("role", "guest")
@@ -124,10 +135,14 @@ def gateway(request: Request, user=Depends(get_current_user)):
         except Exception:
             data = None
     result = route_request(path, method, data, user)
-    response = api_response(result, message="Gateway routed request")
     response.headers["X-RateLimit-Limit"] = str(limit)
     response.headers["X-RateLimit-Remaining"] = str(max(0, limit - count))
-    return response
+    return {
+        "status": "success",
+        "data": result,
+        "message": "Gateway routed request",
+        "errors": [],
+    }
 
 # --- WebSocket Endpoint Preparation ---
 event_bus = EventBus()
@@ -135,18 +150,111 @@ event_bus = EventBus()
 # Redis for connection tracking and pub/sub
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 redis_client = redis.Redis.from_url(REDIS_URL)
+sliding_window_script = redis_client.register_script(SLIDING_WINDOW_LUA)
+async_redis_client = aioredis.Redis.from_url(REDIS_URL)
 
 # JWT secret and algorithm
-SECRET_KEY = config.get("auth", {}).get("secret_key", "CHANGE_THIS_TO_A_RANDOM_SECRET_IN_PRODUCTION")
+SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
 
-# Track active WebSocket connections
+# Heartbeats dominate inbound traffic, so they are matched on the raw text
+# and answered without going through the JSON parser
+PING_PREFIX = '{"type":"ping"'
+PONG_PREFIX = '{"type":"pong","timestamp":'
+
+@dataclass
+class WSConnection:
+    """Per-socket state kept for every connected client."""
+    __slots__ = ("websocket", "connection_id", "connected_at", "roles", "last_activity")
+    websocket: WebSocket
+    connection_id: str
+    connected_at: float
+    roles: tuple
+    last_activity: float
+
+# Track active WebSocket connections (user_id -> WSConnection)
 active_ws_connections = {}
 
-# Import the enhanced JWT validation function from security.py
-from api.security import validate_ws_token, get_ws_user
-from database.connection import get_db_session
-import asyncio
+# Realtime channels fanned out to WebSocket clients. A single pattern
+# subscription per worker replaces one pubsub connection per socket.
+USER_CHANNEL_PATTERN = "user:*:realtime"
+ROLE_CHANNEL_PATTERN = "role:*:broadcasts"
+# Publishing a channel_id here drops the cached join authorization for it
+USER_ACL_CHANNEL_PATTERN = "user:*:acl"
+_pubsub_task = None
+
+# A slow client must not hold up delivery to the others
+REALTIME_SEND_TIMEOUT = 5.0  # seconds
+# Reconnect delay after the pub/sub connection fails, doubling up to the max
+PUBSUB_RECONNECT_MIN = 0.5  # seconds
+PUBSUB_RECONNECT_MAX = 30.0  # seconds
+
+async def _forward_realtime(conn, data):
+    try:
+        await asyncio.wait_for(conn.websocket.send_bytes(data), REALTIME_SEND_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Failed to forward realtime message: {str(e) or type(e).__name__}",
+                       extra={"connection_id": conn.connection_id})
+
+async def _dispatch_realtime_message(message):
+    """Route one realtime Redis message to the locally connected WebSockets."""
+    kind, _, rest = message["channel"].decode().partition(":")
+    target, _, suffix = rest.rpartition(":")
+    if suffix == "acl":
+        await invalidate_channel_authorization(target, message["data"].decode())
+        return
+    if kind == "user":
+        conn = active_ws_connections.get(target)
+        targets = [conn] if conn else []
+    else:
+        targets = [c for c in active_ws_connections.values() if target in c.roles]
+    await asyncio.gather(*(_forward_realtime(conn, message["data"]) for conn in targets))
+
+async def _pubsub_dispatcher():
+    """Keep a pattern subscription open, reconnecting with backoff when it fails."""
+    backoff = PUBSUB_RECONNECT_MIN
+    while True:
+        pubsub = async_redis_client.pubsub()
+        try:
+            await pubsub.psubscribe(USER_CHANNEL_PATTERN, ROLE_CHANNEL_PATTERN, USER_ACL_CHANNEL_PATTERN)
+            backoff = PUBSUB_RECONNECT_MIN
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    await _dispatch_realtime_message(message)
+            logger.warning("Realtime pub/sub stream ended, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Realtime pub/sub dispatcher failed, reconnecting in {backoff}s: {str(e)}")
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:
+                pass
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, PUBSUB_RECONNECT_MAX)
+
+def _log_dispatcher_exit(task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Realtime pub/sub dispatcher stopped: {str(task.exception())}")
+
+def start_pubsub_dispatcher():
+    """Start the realtime dispatcher; called from the application lifespan."""
+    global _pubsub_task
+    _pubsub_task = asyncio.create_task(_pubsub_dispatcher())
+    _pubsub_task.add_done_callback(_log_dispatcher_exit)
+
+async def stop_pubsub_dispatcher():
+    """Cancel the realtime dispatcher and wait for it to close its connection."""
+    global _pubsub_task
+    if _pubsub_task is None:
+        return
+    _pubsub_task.cancel()
+    try:
+        await _pubsub_task
+    except asyncio.CancelledError:
+        pass
+    _pubsub_task = None
 
 # CSRF token validation utility
 def validate_csrf(websocket: WebSocket, csrf_token: str):
@@ -154,12 +262,41 @@ def validate_csrf(websocket: WebSocket, csrf_token: str):
     if not cookie_token or cookie_token != csrf_token:
         raise HTTPException(status_code=403, detail="CSRF token invalid or missing.")
 
+# Channel authorization results are cached briefly so repeated joins
+# don't hit the database each time
+CHANNEL_AUTH_CACHE_TTL = 60  # seconds
+
+def _channel_auth_key(user_id, channel_id):
+    return f"chanauth:{user_id}:{channel_id}"
+
 # Example: channel authorization check
-async def is_user_authorized_for_channel(user_id, channel_id, db):
+async def _check_channel_membership(user_id, channel_id, db):
     # Replace with real DB check for user-channel membership/role
     # For demo, allow all channels
     return True
 
+async def _check_channel_membership_in_session(user_id, channel_id):
+    # Without an async driver (non-PostgreSQL DATABASE_URL) use a sync session
+    if AsyncSessionLocal is None:
+        with db_session() as db:
+            return await _check_channel_membership(user_id, channel_id, db)
+    async with AsyncSessionLocal() as db:
+        return await _check_channel_membership(user_id, channel_id, db)
+
+async def is_user_authorized_for_channel(user_id, channel_id):
+    """Answer from the cache, opening a database session only on a miss."""
+    key = _channel_auth_key(user_id, channel_id)
+    cached = await async_redis_client.get(key)
+    if cached is not None:
+        return cached == b"1"
+    authorized = await _check_channel_membership_in_session(user_id, channel_id)
+    await async_redis_client.setex(key, CHANNEL_AUTH_CACHE_TTL, b"1" if authorized else b"0")
+    return authorized
+
+async def invalidate_channel_authorization(user_id, channel_id):
+    """Drop a cached channel authorization, e.g. after the user's roles change."""
+    await async_redis_client.delete(_channel_auth_key(user_id, channel_id))
+
 @router.websocket(f"/api/{API_VERSION}/ws")
 async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = None):
     """Production-ready WebSocket endpoint with JWT authentication and Redis pub/sub integration."""
@@ -172,12 +309,11 @@ async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = N
     if token.startswith("Bearer "):
         token = token[7:]
         
-    # Get database session
-    db = next(get_db_session())
-    
     try:
-        # Validate token using our enhanced security module
-        user_payload = validate_ws_token(token, db)
+        # Validate token using our enhanced security module; the session is
+        # released right away instead of being held for the socket lifetime
+        with db_session() as db:
+            user_payload = validate_ws_token(token, db)
         user_id = user_payload.get("sub")
         roles = user_payload.get("roles", [])
         
@@ -198,49 +334,37 @@ async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = N
         
         # Track connection with more metadata
         connection_id = str(uuid.uuid4())
-        active_ws_connections[user_id] = {
-            "websocket": websocket,
-            "connection_id": connection_id,
-            "connected_at": time.time(),
-            "user_id": user_id,
-            "roles": roles,
-            "last_activity": time.time()
-        }
+        now = time.time()
+        conn = WSConnection(
+            websocket=websocket,
+            connection_id=connection_id,
+            connected_at=now,
+            roles=tuple(roles),
+            last_activity=now
+        )
+        active_ws_connections[user_id] = conn
         
         # Log connection
         logger.info(f"WebSocket connection established for user {user_id}", 
                    extra={"user_id": user_id, "connection_id": connection_id})
         
-        # Subscribe to user-specific Redis pub/sub channel
-        pubsub = redis_client.pubsub()
-        channel = f"user:{user_id}:realtime"
-        pubsub.subscribe(channel)
-        
-        # Also subscribe to role-based channels
-        for role in roles:
-            role_channel = f"role:{role}:broadcasts"
-            pubsub.subscribe(role_channel)
-        
+        # Redis realtime messages for this user and its roles are delivered
+        # by the shared _pubsub_dispatcher via active_ws_connections.
         try:
             while True:
-                # Check for Redis messages
-                message = pubsub.get_message(timeout=1)
-                if message and message["type"] == "message":
-                    await websocket.send_text(message["data"].decode())
-                
                 # Handle incoming messages from client
                 try:
-                    data = await asyncio.wait_for(websocket.receive_text(), timeout=0.1)
-                    # Channel-specific authorization example
-                    import json
-                    msg = json.loads(data)
+                    data = await asyncio.wait_for(websocket.receive_text(), timeout=1)
+                    # Channel-specific authorization example (heartbeats skip parsing)
+                    msg = {} if data.startswith(PING_PREFIX) else json.loads(data)
                     if msg.get("type") == "join_channel":
                         channel_id = msg.get("channel_id")
-                        if not await is_user_authorized_for_channel(user_id, channel_id, db):
+                        authorized = await is_user_authorized_for_channel(user_id, channel_id)
+                        if not authorized:
                             await websocket.send_json({"type": "error", "error": "Not authorized for this channel."})
                             continue
                     # Update last activity timestamp
-                    active_ws_connections[user_id]["last_activity"] = time.time()
+                    conn.last_activity = time.time()
                     
                     # Process message (could be a ping, command, etc.)
                     await process_ws_message(data, user_id, websocket)
@@ -254,19 +378,16 @@ async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = N
                     logger.error(f"Error processing WebSocket message: {str(msg_err)}", 
                                 exc_info=True, extra={"user_id": user_id})
                 # Implement ping/pong for connection health check
-                if (time.time() - active_ws_connections[user_id]["last_activity"]) > 30:
+                if (time.time() - conn.last_activity) > 30:
                     try:
                         # Send ping to verify connection is still alive
                         await websocket.send_json({"type": "ping", "timestamp": time.time()})
                         # Reset last activity timestamp
-                        active_ws_connections[user_id]["last_activity"] = time.time()
+                        conn.last_activity = time.time()
                     except Exception:
                         # Connection may be dead, break the loop
                         break
                 
-                # Small delay to prevent CPU overuse
-                await asyncio.sleep(0.05)
-                
         except WebSocketDisconnect:
             # Normal disconnection
             logger.info(f"WebSocket disconnected for user {user_id}", 
@@ -278,11 +399,7 @@ async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = N
             if websocket.application_state != WebSocketState.DISCONNECTED:
                 await websocket.close(code=1011, reason=f"Internal error: {str(e)}")
         finally:
-            # Clean up subscriptions and tracked connections
-            pubsub.unsubscribe(channel)
-            for role in roles:
-                pubsub.unsubscribe(f"role:{role}:broadcasts")
-            pubsub.close()
+            # Clean up tracked connection
             active_ws_connections.pop(user_id, None)
     except HTTPException as e:
         # Authentication error
@@ -292,15 +409,14 @@ async def websocket_endpoint(websocket: WebSocket, csrf_token: Optional[str] = N
         # Unexpected error during setup
         logger.error(f"WebSocket setup error: {str(e)}", exc_info=True)
         await websocket.close(code=1011, reason=f"Internal error: {str(e)}")
-    finally:
-        # Ensure database session is closed
-        db.close()
-        
+
 async def process_ws_message(data: str, user_id: str, websocket: WebSocket):
     """Process incoming WebSocket messages from clients"""
+    if data.startswith(PING_PREFIX):
+        await websocket.send_text(f"{PONG_PREFIX}{time.time()}}}")
+        return
     try:
         # Try to parse as JSON
-        import json
         message = json.loads(data)
         
         # Handle message types
@@ -3,6 +3,7 @@ Main entry point for the SpaceNew API
 Registers all API routes and configures middleware
 """
 import logging
+import httpx
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,9 +15,12 @@ from slowapi.util import get_remote_address
 
 from routes import auth, health, metrics, plugin_system, fmt_templates, character_profiles, engine, storage, interface_adapter, endpoint_status
 from mcp_adapter import router as mcp_router
+from gateway import router as gateway_router, start_pubsub_dispatcher, stop_pubsub_dispatcher
+from context_providers.mem0_provider import set_mem0_http_client
 from core.logging import setup_logging
 from core.middleware.logging import RequestLoggingMiddleware
 from config.settings import settings
+from database.connection import async_engine, warm_async_pool
 
 # Configure logging
 setup_logging(
@@ -35,9 +39,23 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting SpaceNew API...")
+    # One pooled HTTP client for mem0, reused across requests
+    app.state.mem0_client = httpx.AsyncClient(timeout=10.0)
+    set_mem0_http_client(app.state.mem0_client)
+    try:
+        await warm_async_pool()
+    except Exception as e:
+        logger.warning(f"Could not warm the database pool: {str(e)}")
+    # Fans realtime Redis messages out to the gateway's WebSocket clients
+    start_pubsub_dispatcher()
     yield
     # Shutdown
     logger.info("Shutting down SpaceNew API...")
+    await stop_pubsub_dispatcher()
+    set_mem0_http_client(None)
+    await app.state.mem0_client.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -91,13 +109,19 @@ app.include_router(storage.router, prefix="/api")
 app.include_router(interface_adapter.router, prefix="/api")
 app.include_router(endpoint_status.router, prefix="/api")
 app.include_router(mcp_router)
+app.include_router(gateway_router)
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        workers=4
+        workers=os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=1000,
+        backlog=2048
     )
@@ -2,194 +2,444 @@
 MCP Adapter Router for Model Context Protocol integration.
 Enables tool/agent interoperability via the Model Context Protocol standard.
 """
-from fastapi import APIRouter, Request, HTTPException, Depends, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 # Removed fastapi_mcp import due to dependency conflicts
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+import asyncio
 import logging
-from pydantic import BaseModel, Field
+import orjson
+import re
+from pydantic import BaseModel, ConfigDict
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+import time
 import uuid
 from datetime import datetime
+from config.settings import settings
 from context_providers.mem0_provider import ContextProvider
 
 # Configure logging
 logger = logging.getLogger("api.mcp_adapter")
 
-router = APIRouter(prefix="/api/mcp", tags=["mcp"])
+router = APIRouter(prefix="/api/mcp", tags=["mcp"], default_response_class=ORJSONResponse)
 
-# Initialize context provider
-context_provider = ContextProvider()
+class CachingContextProvider:
+    """Context provider wrapper that keeps hot contexts in Redis"""
+    
+    def __init__(self, provider: ContextProvider, redis_client: aioredis.Redis, ttl: int):
+        self._provider = provider
+        self._redis = redis_client
+        self._ttl = ttl
+    
+    async def store(self, context_id: str, context_data: Dict[str, Any]) -> None:
+        """Store context and write it through to the cache"""
+        await self._provider.store(context_id, context_data)
+        try:
+            await self._redis.set(f"ctx:{context_id}", orjson.dumps(context_data), ex=self._ttl)
+        except (RedisError, TypeError) as e:
+            logger.warning("Context cache write failed for %s: %s", context_id, e)
+            await self._invalidate(context_id)
+    
+    async def retrieve(self, context_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve context from the cache, falling back to the provider"""
+        try:
+            cached = await self._redis.get(f"ctx:{context_id}")
+            if cached is not None:
+                return orjson.loads(cached)
+        except RedisError as e:
+            logger.warning("Context cache read failed for %s: %s", context_id, e)
+        
+        context = await self._provider.retrieve(context_id)
+        if context:
+            try:
+                await self._redis.set(f"ctx:{context_id}", orjson.dumps(context), ex=self._ttl)
+            except (RedisError, TypeError) as e:
+                logger.warning("Context cache fill failed for %s: %s", context_id, e)
+        return context
+    
+    async def update(self, context_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update context in the provider and invalidate the cached copy"""
+        updated = await self._provider.update(context_id, updates)
+        await self._invalidate(context_id)
+        return updated
+    
+    async def delete(self, context_id: str) -> bool:
+        """Delete context from the provider and the cache"""
+        deleted = await self._provider.delete(context_id)
+        await self._invalidate(context_id)
+        return deleted
+    
+    async def _invalidate(self, context_id: str) -> None:
+        try:
+            await self._redis.delete(f"ctx:{context_id}")
+        except RedisError as e:
+            logger.warning("Context cache invalidation failed for %s: %s", context_id, e)
+
+class BatchedContextProvider:
+    """Context provider wrapper that coalesces concurrent stores and retrieves"""
+    
+    def __init__(self, provider: ContextProvider, max_batch: int, max_wait: float):
+        self._provider = provider
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def store(self, context_id: str, context_data: Dict[str, Any]) -> None:
+        """Queue a store to be written with the current batch"""
+        await self._submit("store", context_id, context_data)
+    
+    async def retrieve(self, context_id: str) -> Optional[Dict[str, Any]]:
+        """Queue a retrieve to be read with the current batch"""
+        return await self._submit("retrieve", context_id, None)
+    
+    async def update(self, context_id: str, updates: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update context directly; updates are not batched"""
+        return await self._provider.update(context_id, updates)
+    
+    async def delete(self, context_id: str) -> bool:
+        """Delete context directly; deletes are not batched"""
+        return await self._provider.delete(context_id)
+    
+    async def _submit(self, op: str, context_id: str, value: Optional[Dict[str, Any]]):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, context_id, value, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Drain the queue, issuing one mstore and one mget per batch"""
+        while True:
+            batch = [await self._queue.get()]
+            if self._max_wait:
+                await asyncio.sleep(self._max_wait)
+            while len(batch) < self._max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            stores = [item for item in batch if item[0] == "store"]
+            retrieves = [item for item in batch if item[0] == "retrieve"]
+            
+            if stores:
+                try:
+                    await self._provider.mstore({context_id: value for _, context_id, value, _ in stores})
+                    self._resolve(stores, lambda context_id: None)
+                except Exception as e:
+                    self._fail(stores, e)
+            
+            if retrieves:
+                try:
+                    results = await self._provider.mget([context_id for _, context_id, _, _ in retrieves])
+                    self._resolve(retrieves, results.get)
+                except Exception as e:
+                    self._fail(retrieves, e)
+    
+    @staticmethod
+    def _resolve(items, result_for) -> None:
+        for _, context_id, _, future in items:
+            if not future.done():
+                future.set_result(result_for(context_id))
+    
+    @staticmethod
+    def _fail(items, error: Exception) -> None:
+        for _, _, _, future in items:
+            if not future.done():
+                future.set_exception(error)
+
+@lru_cache(maxsize=1)
+def get_context_provider() -> ContextProvider:
+    """Context provider for this worker, created on first use"""
+    provider = ContextProvider()
+    if settings.MCP_BATCHING_ENABLED:
+        provider = BatchedContextProvider(
+            provider,
+            settings.MCP_BATCH_MAX_SIZE,
+            settings.MCP_BATCH_MAX_WAIT_MS / 1000
+        )
+    if settings.MCP_REDIS_CACHE_ENABLED:
+        return CachingContextProvider(provider, aioredis.from_url(settings.REDIS_URL), settings.MCP_REDIS_CACHE_TTL)
+    return provider
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_bg_tasks: Set[asyncio.Task] = set()
+
+# In-process LRU cache of recently used contexts (context_id -> (cached_at, data)).
+# It is per worker, so it is bypassed when the shared Redis cache is enabled;
+# otherwise a write on one worker would be hidden by another's stale copy.
+_ctx_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_CTX_TTL = 30  # seconds
+_CTX_MAX = 1024
+
+def _ctx_cache_put(context_id: str, context_data: Dict[str, Any]) -> None:
+    """Insert or refresh a cache entry, evicting the least recently used"""
+    _ctx_cache[context_id] = (time.monotonic(), context_data)
+    _ctx_cache.move_to_end(context_id)
+    if len(_ctx_cache) > _CTX_MAX:
+        _ctx_cache.popitem(last=False)
+
+# Result of the last deep health check, reused for _DEEP_CHECK_INTERVAL seconds
+_last_deep_check = [0.0, None]
+_DEEP_CHECK_INTERVAL = 10
 
 @router.get("/health")
 async def health_check():
     """
-    Health check endpoint for the MCP adapter.
+    Liveness probe for the MCP adapter. Performs no I/O.
+    """
+    return ORJSONResponse({
+        "status": "healthy",
+        "timestamp": _now_iso_cached()
+    })
+
+@router.get("/health/deep")
+async def deep_health_check(provider: ContextProvider = Depends(get_context_provider)):
+    """
+    Deep health check for the MCP adapter.
     Verifies that the adapter and its context provider are functioning correctly.
     """
+    if _last_deep_check[1] is not None and time.monotonic() - _last_deep_check[0] < _DEEP_CHECK_INTERVAL:
+        return ORJSONResponse(_last_deep_check[1])
+    
+    result = await _check_context_provider(provider)
+    _last_deep_check[:] = [time.monotonic(), result]
+    return ORJSONResponse(result)
+
+async def _check_context_provider(provider: ContextProvider) -> Dict[str, Any]:
+    """Round-trip a test context through the provider"""
     try:
         # Generate a test context ID
         test_id = generate_context_id("health")
         
         # Test storing and retrieving context
-        test_data = {"status": "healthy", "timestamp": datetime.now().isoformat()}
-        await context_provider.store(test_id, test_data)
-        retrieved = await context_provider.retrieve(test_id)
+        test_data = {"status": "healthy", "timestamp": _now_iso_cached()}
+        await provider.store(test_id, test_data)
+        retrieved = await provider.retrieve(test_id)
         
-        # Clean up test data
-        await context_provider.delete(test_id)
+        # Clean up test data without delaying the response
+        _run_in_background(provider.delete(test_id))
         
         # Verify the test worked
         if retrieved and retrieved.get("status") == "healthy":
             return {
                 "status": "healthy",
                 "message": "MCP adapter is functioning correctly",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso_cached()
             }
         else:
             return {
                 "status": "degraded",
                 "message": "Context provider test failed",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": _now_iso_cached()
             }
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
         return {
             "status": "unhealthy",
             "message": f"MCP adapter error: {str(e)}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _now_iso_cached()
         }
 
+# ISO timestamp shared by all calls within the same millisecond
+_iso_cache = [0.0, ""]
+
+def _now_iso_cached() -> str:
+    """Current local time in ISO format, reformatted at most once per millisecond"""
+    now = time.time()
+    if now - _iso_cache[0] > 0.001:
+        _iso_cache[:] = [now, datetime.fromtimestamp(now).isoformat()]
+    return _iso_cache[1]
+
+# Timestamp component of context IDs, reformatted at most once per second
+_ts_cache = [0, ""]
+
 def generate_context_id(prefix: str) -> str:
     """Generate a unique context ID with prefix"""
-    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-    unique_id = str(uuid.uuid4())[:8]
-    return f"{prefix}-{timestamp}-{unique_id}"
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[:] = [now, time.strftime("%Y%m%d-%H%M%S", time.localtime(now))]
+    return f"{prefix}-{_ts_cache[1]}-{uuid.uuid4().hex[:8]}"
 
 async def store_context(context_id: str, context_data: Dict[str, Any]) -> None:
     """Store context in the provider"""
-    await context_provider.store(context_id, context_data)
+    await get_context_provider().store(context_id, context_data)
+    if not settings.MCP_REDIS_CACHE_ENABLED:
+        _ctx_cache_put(context_id, context_data)
 
 async def retrieve_context(context_id: str) -> Dict[str, Any]:
-    """Retrieve context from the provider"""
-    return await context_provider.retrieve(context_id)
+    """Retrieve context, serving recently used entries from the local cache"""
+    if settings.MCP_REDIS_CACHE_ENABLED:
+        return await get_context_provider().retrieve(context_id)
+    cached = _ctx_cache.get(context_id)
+    if cached:
+        if time.monotonic() - cached[0] < _CTX_TTL:
+            _ctx_cache.move_to_end(context_id)
+            return cached[1]
+        _ctx_cache.pop(context_id, None)
+    
+    context = await get_context_provider().retrieve(context_id)
+    if context:
+        _ctx_cache_put(context_id, context)
+    return context
 
-async def update_context(context_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
-    """Update existing context"""
-    context = await context_provider.retrieve(context_id)
-    if not context:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Context not found: {context_id}"
-        )
-    
-    # Deep merge updates
-    updated_context = deep_merge(context, updates)
-    await context_provider.store(context_id, updated_context)
-    return updated_context
+def _run_in_background(coro) -> None:
+    """Schedule tracking writes that don't gate the response"""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_on_background_done)
+
+def _on_background_done(task: asyncio.Task) -> None:
+    _bg_tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error("Background context write failed: %s", task.exception())
 
 def deep_merge(base: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
     """Deep merge two dictionaries"""
-    merged = base.copy()
-    for key, value in updates.items():
-        if (
-            key in merged and 
-            isinstance(merged[key], dict) and 
-            isinstance(value, dict)
-        ):
-            merged[key] = deep_merge(merged[key], value)
+    return deep_merge_inplace({**base}, updates)
+
+def deep_merge_inplace(target: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge updates into target, copying only the nested dicts that change"""
+    stack = [(target, updates)]
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            existing = dst.get(key)
+            if type(existing) is dict and type(value) is dict:
+                existing = dst[key] = {**existing}
+                stack.append((existing, value))
+            else:
+                dst[key] = value
+    return target
+
+# Prediction payloads estimated above this many bytes are streamed to the client
+_STREAM_THRESHOLD = 64 * 1024
+
+def _estimated_size(obj: Any, limit: int = _STREAM_THRESHOLD) -> int:
+    """Rough serialized size of obj, stopping early once limit is exceeded"""
+    size = 0
+    stack = [obj]
+    while stack and size <= limit:
+        item = stack.pop()
+        if isinstance(item, (str, bytes)):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2 * len(item) + 2
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            size += len(item) + 2
+            stack.extend(item)
         else:
-            merged[key] = value
-    return merged
+            size += 8
+    return size
+
+def _stream_prediction(prediction_result: Dict[str, Any]):
+    """Serialize a prediction response piecewise, one output key at a time"""
+    # Every member is framed here, outputs last, so the document stays valid
+    # whichever other keys the prediction has
+    yield b'{"status":"success","prediction":{' + b"".join(
+        orjson.dumps(key) + b":" + orjson.dumps(value) + b","
+        for key, value in prediction_result.items() if key != "outputs"
+    ) + b'"outputs":{'
+    for index, (key, value) in enumerate(prediction_result["outputs"].items()):
+        yield (b"," if index else b"") + orjson.dumps(key) + b":" + orjson.dumps(value)
+    yield b"}}}"
 
 class ContextRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     context_type: str
     data: Dict[str, Any]
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 class ToolRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     tool_name: str
     parameters: Dict[str, Any]
     context_id: Optional[str] = None
 
 class ContextUpdateRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    
     context_id: str
     updates: Dict[str, Any]
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 class ModelRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", protected_namespaces=())
+    
     model_name: str
     model_type: str
     parameters: Dict[str, Any]
-    metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None
 
 class PredictRequest(BaseModel):
+    model_config = ConfigDict(extra="ignore", protected_namespaces=())
+    
     model_id: str
     inputs: Dict[str, Any]
     context_id: Optional[str] = None
-    parameters: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    parameters: Optional[Dict[str, Any]] = None
 
 @router.post("/context")
-async def mcp_context_endpoint(request: Request, context_data: ContextRequest):
+async def mcp_context_endpoint(context_data: ContextRequest):
     """
     Handle incoming context requests from external components.
     """
     try:
-        logger.info(f"Received context request for type: {context_data.context_type}")
+        logger.info("Received context request for type: %s", context_data.context_type)
         
         # Process the context based on type
         processed_context = await process_context(context_data)
         
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "context_id": processed_context.get("id"),
-                "data": processed_context
-            }
-        )
+        return ORJSONResponse({
+            "status": "success",
+            "context_id": processed_context.get("id"),
+            "data": processed_context
+        })
     except Exception as e:
-        logger.error(f"Error processing context: {str(e)}")
+        logger.error("Error processing context: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process context: {str(e)}"
         )
 
 @router.post("/tool-invoke")
-async def mcp_tool_invoke(request: Request, tool_data: ToolRequest):
+async def mcp_tool_invoke(tool_data: ToolRequest):
     """
     Handle tool invocation requests from external components.
     """
     try:
-        logger.info(f"Received tool invocation request for: {tool_data.tool_name}")
+        logger.info("Received tool invocation request for: %s", tool_data.tool_name)
         
         # Validate and execute the tool
         result = await execute_tool(tool_data)
         
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "tool": tool_data.tool_name,
-                "result": result
-            }
-        )
+        return ORJSONResponse({
+            "status": "success",
+            "tool": tool_data.tool_name,
+            "result": result
+        })
     except Exception as e:
-        logger.error(f"Error executing tool: {str(e)}")
+        logger.error("Error executing tool: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to execute tool: {str(e)}"
         )
 
 @router.post("/context/update")
-async def update_context_endpoint(request: Request, update_data: ContextUpdateRequest):
+async def update_context_endpoint(update_data: ContextUpdateRequest):
     """
     Handle context update requests from external components.
     """
     try:
-        logger.info(f"Received context update request for ID: {update_data.context_id}")
+        logger.info("Received context update request for ID: %s", update_data.context_id)
         
-        # Process the context update
-        # Retrieve existing context
+        # Retrieve existing context once and apply all changes in memory
         context = await retrieve_context(update_data.context_id)
         if not context:
             raise HTTPException(
@@ -197,42 +447,35 @@ async def update_context_endpoint(request: Request, update_data: ContextUpdateRe
                 detail=f"Context not found: {update_data.context_id}"
             )
         
-        # Update context
-        updated_context = await update_context(update_data.context_id, update_data.updates)
+        updated_context = deep_merge(context, update_data.updates)
         
-        # Apply metadata updates if provided
+        # Apply metadata updates if provided, merging with existing metadata
         if update_data.metadata:
-            # If context already has metadata, merge with new metadata
-            if "metadata" in updated_context:
-                updated_metadata = deep_merge(updated_context["metadata"], update_data.metadata)
-            else:
-                updated_metadata = update_data.metadata
-            
-            await update_context(update_data.context_id, {"metadata": updated_metadata})
-            updated_context["metadata"] = updated_metadata
+            deep_merge_inplace(updated_context, {"metadata": update_data.metadata})
         
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "context_id": update_data.context_id,
-                "updated_data": updated_context
-            }
-        )
+        await store_context(update_data.context_id, updated_context)
+        
+        return ORJSONResponse({
+            "status": "success",
+            "context_id": update_data.context_id,
+            "updated_data": updated_context
+        })
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error updating context: {str(e)}")
+        logger.error("Error updating context: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to update context: {str(e)}"
         )
 
 @router.post("/model")
-async def register_model(request: Request, model_data: ModelRequest):
+async def register_model(model_data: ModelRequest):
     """
     Register a new model with the system
     """
     try:
-        logger.info(f"Registering model: {model_data.model_name}")
+        logger.info("Registering model: %s", model_data.model_name)
         
         model_id = f"{model_data.model_type}-{model_data.model_name}"
         
@@ -242,48 +485,49 @@ async def register_model(request: Request, model_data: ModelRequest):
             "name": model_data.model_name,
             "type": model_data.model_type,
             "parameters": model_data.parameters,
-            "metadata": model_data.metadata,
-            "registered_at": datetime.now().isoformat()
+            "metadata": model_data.metadata if model_data.metadata is not None else {},
+            "registered_at": _now_iso_cached()
         }
         
         await store_context(f"model-{model_id}", model_config)
         
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "model_id": model_id,
-                "config": model_config
-            }
-        )
+        return ORJSONResponse({
+            "status": "success",
+            "model_id": model_id,
+            "config": model_config
+        })
         
     except Exception as e:
-        logger.error(f"Error registering model: {str(e)}")
+        logger.error("Error registering model: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 @router.post("/predict")
-async def model_predict(request: Request, predict_data: PredictRequest):
+async def model_predict(predict_data: PredictRequest):
     """
     Make predictions using a registered model
     """
     try:
-        logger.info(f"Prediction request for model: {predict_data.model_id}")
+        logger.info("Prediction request for model: %s", predict_data.model_id)
+        
+        # Retrieve model configuration and, if provided, the context concurrently
+        lookups = [retrieve_context(f"model-{predict_data.model_id}")]
+        if predict_data.context_id:
+            lookups.append(retrieve_context(predict_data.context_id))
+        results = await asyncio.gather(*lookups)
         
-        # Retrieve model configuration
-        model_config = await retrieve_context(f"model-{predict_data.model_id}")
+        model_config = results[0]
         if not model_config:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Model not found: {predict_data.model_id}"
             )
         
-        # Get context if provided
         context = None
         if predict_data.context_id:
-            context = await retrieve_context(predict_data.context_id)
+            context = results[1]
             if not context:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -301,17 +545,6 @@ async def model_predict(request: Request, predict_data: PredictRequest):
         # Generate prediction ID for tracking
         prediction_id = generate_context_id("prediction")
         
-        # Store prediction request
-        await store_context(prediction_id, {
-            "id": prediction_id,
-            "model_id": predict_data.model_id,
-            "inputs": predict_data.inputs,
-            "context_id": predict_data.context_id,
-            "parameters": predict_data.parameters,
-            "timestamp": datetime.now().isoformat(),
-            "status": "pending"
-        })
-        
         # TODO: Implement actual model prediction logic here
         # This would typically involve:
         # 1. Loading the appropriate model
@@ -333,125 +566,76 @@ async def model_predict(request: Request, predict_data: PredictRequest):
             }
         }
         
-        # Update prediction status
-        await update_context(prediction_id, {
+        # Persist the completed prediction in a single write without delaying the response
+        _run_in_background(store_context(prediction_id, {
+            "id": prediction_id,
+            "model_id": predict_data.model_id,
+            "inputs": predict_data.inputs,
+            "context_id": predict_data.context_id,
+            "parameters": predict_data.parameters,
+            "timestamp": _now_iso_cached(),
             "status": "completed",
             "outputs": prediction_result["outputs"],
             "metadata": prediction_result["metadata"]
-        })
+        }))
         
-        return JSONResponse(
-            status_code=status.HTTP_200_OK,
-            content={
-                "status": "success",
-                "prediction": prediction_result
-            }
-        )
+        # Stream large outputs instead of serializing the whole response at once
+        if _estimated_size(prediction_result["outputs"]) > _STREAM_THRESHOLD:
+            return StreamingResponse(_stream_prediction(prediction_result), media_type="application/json")
+        
+        return ORJSONResponse({
+            "status": "success",
+            "prediction": prediction_result
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error making prediction: {str(e)}")
+        logger.error("Error making prediction: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
+# Fields stored for each context type: (field, key in request data, default factory)
+_CONTEXT_FIELDS = {
+    "conversation": (("messages", "messages", list), ("state", "state", dict)),
+    "document": (("content", "content", None), ("doc_type", "type", lambda: "text")),
+    "tool": (("tool_name", "tool_name", None), ("parameters", "parameters", dict)),
+    "system": (("system_type", "system_type", None), ("config", "config", dict))
+}
+
 async def process_context(context_data: ContextRequest) -> Dict[str, Any]:
     """Process and store context based on type"""
-    context_types = {
-        "conversation": process_conversation_context,
-        "document": process_document_context,
-        "tool": process_tool_context,
-        "system": process_system_context
-    }
-    
-    processor = context_types.get(context_data.context_type)
-    if not processor:
+    fields = _CONTEXT_FIELDS.get(context_data.context_type)
+    if not fields:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported context type: {context_data.context_type}"
         )
     
-    return await processor(context_data.data, context_data.metadata)
-
-async def process_conversation_context(data: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """Process conversation history and state"""
-    # Extract messages and state
-    messages = data.get("messages", [])
-    state = data.get("state", {})
-    
-    # Generate context ID
-    context_id = generate_context_id("conversation")
-    
-    # Store in context provider
-    context = {
-        "id": context_id,
-        "type": "conversation",
-        "messages": messages,
-        "state": state,
-        "metadata": metadata
-    }
-    await store_context(context_id, context)
-    
-    return context
-
-async def process_document_context(data: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """Process document content and structure"""
-    content = data.get("content")
-    doc_type = data.get("type", "text")
-    
-    # Generate context ID
-    context_id = generate_context_id("document")
-    
-    # Process and store document
-    context = {
-        "id": context_id,
-        "type": "document",
-        "content": content,
-        "doc_type": doc_type,
-        "metadata": metadata
-    }
-    await store_context(context_id, context)
-    
-    return context
-
-async def process_tool_context(data: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """Process tool state and parameters"""
-    tool_name = data.get("tool_name")
-    params = data.get("parameters", {})
-    
-    # Generate context ID
-    context_id = generate_context_id("tool")
-    
-    # Store tool context
-    context = {
-        "id": context_id,
-        "type": "tool",
-        "tool_name": tool_name,
-        "parameters": params,
-        "metadata": metadata
-    }
-    await store_context(context_id, context)
-    
-    return context
+    # Metadata is optional; only allocate an empty dict when it is absent
+    metadata = context_data.metadata
+    if metadata is None:
+        metadata = {}
+    return await _process_typed_context(context_data.context_type, fields, context_data.data, metadata)
 
-async def process_system_context(data: Dict[str, Any], metadata: Dict[str, Any]) -> Dict[str, Any]:
-    """Process system state and configuration"""
-    system_type = data.get("system_type")
-    config = data.get("config", {})
-    
+async def _process_typed_context(
+    context_type: str,
+    fields: Tuple[Tuple[str, str, Any], ...],
+    data: Dict[str, Any],
+    metadata: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Build and store a context record of the given type"""
     # Generate context ID
-    context_id = generate_context_id("system")
-    
-    # Store system context
-    context = {
-        "id": context_id,
-        "type": "system",
-        "system_type": system_type,
-        "config": config,
-        "metadata": metadata
-    }
+    context_id = generate_context_id(context_type)
+    
+    # Only the type's declared fields are kept; their values are owned by this
+    # request, so they are referenced rather than copied
+    context = {"id": context_id, "type": context_type}
+    for field, source, default in fields:
+        context[field] = data[source] if source in data else (default() if default else None)
+    context["metadata"] = metadata
     await store_context(context_id, context)
     
     return context
@@ -459,25 +643,17 @@ async def process_system_context(data: Dict[str, Any], metadata: Dict[str, Any])
 async def execute_tool(tool_data: ToolRequest) -> Dict[str, Any]:
     """Execute the requested tool with given parameters."""
     
-    # Dictionary of available tools
-    tools = {
-        "text_summarizer": execute_text_summarizer,
-        "sentiment_analyzer": execute_sentiment_analyzer,
-        "question_answerer": execute_question_answerer,
-        "translation": execute_translation,
-        "extraction": execute_extraction
-    }
-    
     # Check if tool exists
-    if tool_data.tool_name not in tools:
+    tool_fn = _TOOLS.get(tool_data.tool_name)
+    if tool_fn is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Tool not found: {tool_data.tool_name}"
         )
     
-    # Get context if provided
+    # Get context if provided and the tool actually reads it
     context = None
-    if tool_data.context_id:
+    if tool_data.context_id and getattr(tool_fn, "_uses_context", False):
         context = await retrieve_context(tool_data.context_id)
         if not context:
             raise HTTPException(
@@ -486,7 +662,6 @@ async def execute_tool(tool_data: ToolRequest) -> Dict[str, Any]:
             )
     
     # Execute the tool
-    tool_fn = tools[tool_data.tool_name]
     result = await tool_fn(tool_data.parameters, context)
     
     # Generate and store execution record
@@ -497,10 +672,10 @@ async def execute_tool(tool_data: ToolRequest) -> Dict[str, Any]:
         "parameters": tool_data.parameters,
         "context_id": tool_data.context_id,
         "result": result,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso_cached()
     }
     
-    await store_context(execution_id, execution_record)
+    _run_in_background(store_context(execution_id, execution_record))
     
     return {
         "execution_id": execution_id,
@@ -523,11 +698,12 @@ async def execute_text_summarizer(parameters: Dict[str, Any], context: Optional[
     if len(text) <= max_length:
         summary = text
     else:
-        # Very basic summarization - first sentence plus length restriction
-        sentences = text.split(".")
-        summary = sentences[0] + "."
-        if len(summary) < max_length and len(sentences) > 1:
-            summary += " " + sentences[1] + "."
+        # Very basic summarization - first sentence plus length restriction.
+        # partition() stops at the first period instead of splitting the whole text.
+        first, sep, rest = text.partition(".")
+        summary = first + "."
+        if len(summary) < max_length and sep:
+            summary += " " + rest.partition(".")[0] + "."
         summary = summary[:max_length] + ("..." if len(summary) > max_length else "")
     
     return {
@@ -536,6 +712,10 @@ async def execute_text_summarizer(parameters: Dict[str, Any], context: Optional[
         "summary_length": len(summary)
     }
 
+# Whole-word sentiment lexicon matchers
+_POSITIVE_WORDS_RE = re.compile(r"\b(?:good|great|excellent|happy|like|love|best)\b")
+_NEGATIVE_WORDS_RE = re.compile(r"\b(?:bad|terrible|awful|hate|dislike|worst)\b")
+
 async def execute_sentiment_analyzer(parameters: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Analyze sentiment of text"""
     text = parameters.get("text", "")
@@ -547,13 +727,10 @@ async def execute_sentiment_analyzer(parameters: Dict[str, Any], context: Option
         )
     
     # Simple sentiment analysis (in production would use proper NLP)
-    positive_words = ["good", "great", "excellent", "happy", "like", "love", "best"]
-    negative_words = ["bad", "terrible", "awful", "hate", "dislike", "worst"]
-    
     text_lower = text.lower()
     
-    pos_count = sum(1 for word in positive_words if word in text_lower)
-    neg_count = sum(1 for word in negative_words if word in text_lower)
+    pos_count = len(_POSITIVE_WORDS_RE.findall(text_lower))
+    neg_count = len(_NEGATIVE_WORDS_RE.findall(text_lower))
     
     total = pos_count + neg_count
     if total == 0:
@@ -599,6 +776,8 @@ async def execute_question_answerer(parameters: Dict[str, Any], context: Optiona
         "sources": []
     }
 
+execute_question_answerer._uses_context = True
+
 async def execute_translation(parameters: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Translate text between languages"""
     text = parameters.get("text", "")
@@ -624,6 +803,8 @@ async def execute_translation(parameters: Dict[str, Any], context: Optional[Dict
         "target_lang": target_lang
     }
 
+_STOPWORDS = frozenset({"the", "a", "an", "in", "on", "at", "to", "for", "with", "by", "about", "like"})
+
 async def execute_extraction(parameters: Dict[str, Any], context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Extract structured information from text"""
     text = parameters.get("text", "")
@@ -638,10 +819,9 @@ async def execute_extraction(parameters: Dict[str, Any], context: Optional[Dict[
     # Simple entity extraction (for demonstration)
     if extract_type == "entities":
         # Very simple entity recognition
-        potential_entities = text.split()
         entities = [
-            word for word in potential_entities 
-            if word and word[0].isupper() and len(word) > 1
+            word for word in text.split()
+            if len(word) > 1 and word[:1].isupper()
         ]
         
         return {
@@ -651,17 +831,18 @@ async def execute_extraction(parameters: Dict[str, Any], context: Optional[Dict[
     
     # Simple keyword extraction
     elif extract_type == "keywords":
-        # Very simple keyword extraction
-        words = text.lower().split()
-        stopwords = ["the", "a", "an", "in", "on", "at", "to", "for", "with", "by", "about", "like"]
-        keywords = [
-            word for word in words 
-            if word and len(word) > 3 and word not in stopwords
-        ]
+        # Very simple keyword extraction: count every keyword, keep the first 10
+        keywords = []
+        count = 0
+        for word in text.lower().split():
+            if len(word) > 3 and word not in _STOPWORDS:
+                count += 1
+                if count <= 10:
+                    keywords.append(word)
         
         return {
-            "keywords": keywords[:10],  # Limit to top 10
-            "count": len(keywords)
+            "keywords": keywords,
+            "count": count
         }
     
     else:
@@ -669,3 +850,12 @@ async def execute_extraction(parameters: Dict[str, Any], context: Optional[Dict[
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Unsupported extraction type: {extract_type}"
         )
+
+# Dictionary of available tools
+_TOOLS = {
+    "text_summarizer": execute_text_summarizer,
+    "sentiment_analyzer": execute_sentiment_analyzer,
+    "question_answerer": execute_question_answerer,
+    "translation": execute_translation,
+    "extraction": execute_extraction
+}
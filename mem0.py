@@ -3,7 +3,7 @@ Simple Memory Service Client for API
 This is a simple implementation of a memory service client
 that can be used to store and retrieve memories.
 """
-import requests
+import httpx
 import logging
 from typing import Dict, Any, List, Optional
 
@@ -16,7 +16,8 @@ class Memory:
         self, 
         api_key: Optional[str] = None, 
         base_url: str = "https://api.mem0.ai",
-        collection: str = "default"
+        collection: str = "default",
+        client: Optional[httpx.AsyncClient] = None
     ):
         self.api_key = api_key
         self.base_url = base_url.rstrip('/')
@@ -26,10 +27,12 @@ class Memory:
         }
         if api_key:
             self.headers["Authorization"] = f"Bearer {api_key}"
+        # Shared, app-owned HTTP client (keep-alive and connection pooling)
+        self._client = client
         
         logger.info(f"Initialized Memory client with collection: {collection}")
     
-    def add_memory(self, user_id: str, content: str) -> Dict[str, Any]:
+    async def add_memory(self, user_id: str, content: str) -> Dict[str, Any]:
         """Add a memory for a user"""
         # If no external service, store in-memory
         return {
@@ -39,12 +42,12 @@ class Memory:
             "status": "stored"
         }
     
-    def get_memories(self, user_id: str) -> List[Dict[str, Any]]:
+    async def get_memories(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all memories for a user"""
         # Return empty list as this is a stub implementation
         return []
     
-    def update_memory(self, user_id: str, memory_id: str, content: str) -> Dict[str, Any]:
+    async def update_memory(self, user_id: str, memory_id: str, content: str) -> Dict[str, Any]:
         """Update a memory"""
         return {
             "id": memory_id,
@@ -53,12 +56,12 @@ class Memory:
             "status": "updated"
         }
     
-    def search_memories(self, user_id: str, query: str) -> List[Dict[str, Any]]:
+    async def search_memories(self, user_id: str, query: str) -> List[Dict[str, Any]]:
         """Search memories for a user"""
         # Return empty results as this is a stub implementation
         return []
     
-    def clear_memories(self, user_id: str) -> Dict[str, Any]:
+    async def clear_memories(self, user_id: str) -> Dict[str, Any]:
         """Clear all memories for a user"""
         return {
             "user_id": user_id,
@@ -1,10 +1,11 @@
 """
 Core API models and schemas for the SpaceNew platform.
 """
+import re
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional, Any, Union, Literal
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, validator
 
 # Common types and enums
 
@@ -76,6 +77,11 @@ class SortParams(BaseModel):
 
 # User and authentication models
 
+# Shared validation patterns. Pydantic compiles the email pattern once when
+# the models are built; the username regex is compiled here at import.
+_EMAIL_PATTERN = r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$"
+_USERNAME_RE = re.compile(r"[A-Za-z0-9_-]+")
+
 class UserRole(str, Enum):
     """User roles in the system"""
     ADMIN = "admin"
@@ -87,24 +93,23 @@ class UserRole(str, Enum):
 class UserCreate(BaseModel):
     """Model for creating a new user"""
     username: str = Field(..., min_length=3, max_length=50)
-    email: str = Field(..., regex=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+    email: str = Field(..., pattern=_EMAIL_PATTERN)
     password: str = Field(..., min_length=8)
     role: UserRole = Field(default=UserRole.USER, description="User role")
     
     @validator("username")
     def username_alphanumeric(cls, v):
-        if not v.replace("_", "").replace("-", "").isalnum():
+        if not _USERNAME_RE.fullmatch(v):
             raise ValueError("Username must be alphanumeric")
         return v
 
 class UserUpdate(BaseModel):
     """Model for updating a user"""
-    email: Optional[str] = Field(None, regex=r"^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$")
+    email: Optional[str] = Field(None, pattern=_EMAIL_PATTERN)
     password: Optional[str] = Field(None, min_length=8)
     role: Optional[UserRole] = None
 
-    class Config:
-        extra = "forbid"
+    model_config = ConfigDict(extra="forbid")
 
 class UserRead(BaseModel):
     """Model for reading a user"""
@@ -115,8 +120,7 @@ class UserRead(BaseModel):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 class Token(BaseModel):
     """Authentication token model"""
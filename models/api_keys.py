@@ -4,14 +4,29 @@ Handles storage and management of external service API keys
 """
 
 from sqlalchemy import Column, String, Boolean, DateTime, Text, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from database.connection import Base
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
+from functools import lru_cache
 import json
 from cryptography.fernet import Fernet
 import os
 import base64
 
+# JSONB on PostgreSQL, plain JSON elsewhere (e.g. SQLite in tests)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+# Raw Fernet tokens always start with the base64 form of the 0x80 version byte
+_FERNET_TOKEN_PREFIX = "gAAAAA"
+
+
+def _decrypt_token(fernet: Fernet, token: str) -> str:
+    """Decrypt a stored key, accepting legacy base64-wrapped Fernet tokens"""
+    if token.startswith(_FERNET_TOKEN_PREFIX):
+        return fernet.decrypt(token.encode("ascii")).decode()
+    return fernet.decrypt(base64.b64decode(token.encode())).decode()
+
 
 class APIKeyManager(Base):
     """Model for managing external service API keys"""
@@ -22,15 +37,16 @@ class APIKeyManager(Base):
     service_name = Column(String, nullable=False, index=True)  # e.g., "openai", "anthropic", "google_pse"
     service_category = Column(String, nullable=False, index=True)  # e.g., "ai_models", "search", "storage"
     api_key = Column(Text, nullable=False)  # Encrypted API key
-    configuration = Column(JSON, default=dict)  # Additional service configuration
+    configuration = Column(JSONDocument, default=dict)  # Additional service configuration
     is_active = Column(Boolean, default=True)
     description = Column(Text)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_encryption_key() -> bytes:
-        """Get or create encryption key for API keys"""
+        """Get or create encryption key for API keys (read once per process)"""
         key_path = "data/encryption.key"
         if os.path.exists(key_path):
             with open(key_path, "rb") as f:
@@ -43,14 +59,18 @@ class APIKeyManager(Base):
                 f.write(key)
             return key
     
+    @classmethod
+    @lru_cache(maxsize=1)
+    def get_fernet(cls) -> Fernet:
+        """Shared Fernet instance for the process-wide encryption key"""
+        return Fernet(cls.get_encryption_key())
+    
     def encrypt_api_key(self, plain_key: str) -> str:
         """Encrypt API key for storage"""
         if not plain_key:
             return ""
         
-        fernet = Fernet(self.get_encryption_key())
-        encrypted = fernet.encrypt(plain_key.encode())
-        return base64.b64encode(encrypted).decode()
+        return self.get_fernet().encrypt(plain_key.encode()).decode("ascii")
     
     def decrypt_api_key(self) -> str:
         """Decrypt API key for use"""
@@ -58,10 +78,7 @@ class APIKeyManager(Base):
             return ""
         
         try:
-            fernet = Fernet(self.get_encryption_key())
-            encrypted_bytes = base64.b64decode(self.api_key.encode())
-            decrypted = fernet.decrypt(encrypted_bytes)
-            return decrypted.decode()
+            return _decrypt_token(self.get_fernet(), self.api_key)
         except Exception:
             return ""
     
@@ -72,6 +89,22 @@ class APIKeyManager(Base):
     def get_api_key(self) -> str:
         """Get decrypted API key"""
         return self.decrypt_api_key()
+    
+    @classmethod
+    def bulk_decrypt(cls, rows: Iterable["APIKeyManager"]) -> List[str]:
+        """Decrypt the API keys of many rows with a single Fernet instance"""
+        fernet = cls.get_fernet()
+        decrypted = []
+        for row in rows:
+            try:
+                decrypted.append(_decrypt_token(fernet, row.api_key) if row.api_key else "")
+            except Exception:
+                decrypted.append("")
+        return decrypted
+    
+    def has_legacy_encoding(self) -> bool:
+        """Whether the stored key still uses the old base64-wrapped format"""
+        return bool(self.api_key) and not self.api_key.startswith(_FERNET_TOKEN_PREFIX)
 
 
 class IntegrationConfig(Base):
@@ -82,9 +115,9 @@ class IntegrationConfig(Base):
     id = Column(String, primary_key=True, index=True)
     integration_name = Column(String, nullable=False, unique=True, index=True)
     is_enabled = Column(Boolean, default=False)
-    configuration = Column(JSON, default=dict)
-    environment_mappings = Column(JSON, default=dict)  # Maps to environment variables
-    required_keys = Column(JSON, default=list)  # Required API keys/config
+    configuration = Column(JSONDocument, default=dict)
+    environment_mappings = Column(JSONDocument, default=dict)  # Maps to environment variables
+    required_keys = Column(JSONDocument, default=list)  # Required API keys/config
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -97,7 +130,7 @@ class DeploymentEnvironment(Base):
     id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True, index=True)  # e.g., "development", "production", "staging"
     description = Column(Text)
-    configuration = Column(JSON, default=dict)  # Environment-specific settings
+    configuration = Column(JSONDocument, default=dict)  # Environment-specific settings
     is_active = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -6,17 +6,178 @@ from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 import logging
 from decimal import Decimal
-import uuid
+from functools import lru_cache
+from operator import attrgetter
+import secrets
+
+import orjson
+
+from sqlalchemy import Text, select, insert, update, delete, union, union_all, func, cast, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import models
 
 # Configure logging
 logger = logging.getLogger("financial_business.db.repository")
 
+# Per-model attribute getters used by the *_to_dict helpers (one C-level call per row)
+_account_values = attrgetter(
+    "id", "account_number", "balance", "currency", "owner_id", "account_type",
+    "status", "created_at", "updated_at", "metadata"
+)
+_transaction_values = attrgetter(
+    "id", "transaction_ref", "source_account_id", "destination_account_id", "amount", "currency",
+    "transaction_type", "status", "description", "created_at", "updated_at", "metadata"
+)
+_admin_user_values = attrgetter(
+    "id", "name", "email", "role", "is_active", "last_login", "created_at", "updated_at", "permissions"
+)
+_metric_values = attrgetter("id", "metric_name", "metric_value", "dimensions", "timestamp", "expiry")
+_audit_values = attrgetter(
+    "id", "action", "entity_type", "entity_id", "actor_id", "actor_type", "timestamp", "ip_address", "details"
+)
+
+class AuditEvent:
+    """Audit log entry, written in the same database transaction as the change it records"""
+    
+    __slots__ = ("action", "entity_type", "entity_id", "actor_id", "actor_type", "ip_address", "details")
+    
+    def __init__(self, action: str, entity_type: str, entity_id: str,
+                 actor_id: Optional[int] = None, actor_type: str = "user",
+                 ip_address: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
+        self.action = action
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.actor_id = actor_id
+        self.actor_type = actor_type
+        self.ip_address = ip_address
+        self.details = details
+    
+    def to_row(self) -> Dict[str, Any]:
+        """Column values for the audit_log insert"""
+        return {
+            "action": self.action,
+            "entity_type": self.entity_type,
+            "entity_id": self.entity_id,
+            "actor_id": self.actor_id,
+            "actor_type": self.actor_type,
+            "ip_address": self.ip_address,
+            "details": self.details
+        }
+
+# Page size from which list_account_transactions reads through a server-side cursor
+_STREAM_ROWS_THRESHOLD = 100
+
+# List statements are built once per filter combination and parameterised with
+# bindparam, so SQLAlchemy's compiled cache reuses them across calls
+
+@lru_cache(maxsize=None)
+def _list_accounts_stmt(by_owner: bool):
+    # Keyset pagination: seek past the last id seen instead of scanning an OFFSET
+    query = select(models.Account).where(models.Account.id > bindparam("after_id"))
+    if by_owner:
+        query = query.where(models.Account.owner_id == bindparam("owner_id"))
+    return query.order_by(models.Account.id).limit(bindparam("limit"))
+
+@lru_cache(maxsize=None)
+def _list_account_transactions_stmt():
+    # Summary columns only; description, metadata and updated_at stay in the database.
+    # Each side is read newest-first from its own covering (account, created_at)
+    # index, just enough rows to fill the page, and the two are merged; an OR
+    # across both columns can't use either index's order.
+    Transaction = models.Transaction
+    columns = (
+        Transaction.id,
+        Transaction.transaction_ref,
+        Transaction.source_account_id,
+        Transaction.destination_account_id,
+        Transaction.amount,
+        Transaction.currency,
+        Transaction.transaction_type,
+        Transaction.status,
+        Transaction.created_at
+    )
+    newest_first = (Transaction.created_at.desc(), Transaction.id.desc())
+    sent = select(*columns).where(
+        Transaction.source_account_id == bindparam("account_id")
+    ).order_by(*newest_first).limit(bindparam("window")).subquery()
+    # Transfers to the same account are already on the source side
+    received = select(*columns).where(
+        Transaction.destination_account_id == bindparam("account_id"),
+        Transaction.source_account_id.is_distinct_from(bindparam("account_id"))
+    ).order_by(*newest_first).limit(bindparam("window")).subquery()
+    both = union_all(select(sent), select(received)).subquery()
+    return select(both).order_by(
+        both.c.created_at.desc(), both.c.id.desc()
+    ).offset(bindparam("offset")).limit(bindparam("limit"))
+
+@lru_cache(maxsize=None)
+def _list_admin_users_stmt():
+    return select(models.AdminUser).offset(bindparam("offset")).limit(bindparam("limit"))
+
+@lru_cache(maxsize=None)
+def _get_metrics_stmt(by_name: bool, by_dimensions: bool):
+    query = select(models.Metric)
+    if by_name:
+        query = query.where(models.Metric.metric_name == bindparam("metric_name"))
+    if by_dimensions:
+        query = query.where(models.Metric.dimensions == bindparam("dimensions"))
+    return query.limit(bindparam("limit"))
+
+@lru_cache(maxsize=None)
+def _recent_transactions_stmt():
+    # A transaction belongs to both its source and destination account, so rank
+    # each side separately and keep the newest rows per account
+    account_transactions = union(
+        select(
+            models.Transaction.id.label("transaction_id"),
+            models.Transaction.source_account_id.label("account_id"),
+            models.Transaction.created_at
+        ).where(models.Transaction.source_account_id.in_(bindparam("account_ids", expanding=True))),
+        select(
+            models.Transaction.id,
+            models.Transaction.destination_account_id,
+            models.Transaction.created_at
+        ).where(models.Transaction.destination_account_id.in_(bindparam("account_ids", expanding=True)))
+    ).subquery()
+    ranked = select(
+        account_transactions.c.account_id,
+        account_transactions.c.transaction_id,
+        func.row_number().over(
+            partition_by=account_transactions.c.account_id,
+            order_by=(account_transactions.c.created_at.desc(), account_transactions.c.transaction_id.desc())
+        ).label("position")
+    ).subquery()
+    
+    return select(ranked.c.account_id, models.Transaction).join(
+        models.Transaction, models.Transaction.id == ranked.c.transaction_id
+    ).where(ranked.c.position <= bindparam("per_account")).order_by(ranked.c.account_id, ranked.c.position)
+
+# Balance handler per transaction type and the payload accounts it takes, in order
+_TRANSACTION_HANDLERS = {
+    "transfer": ("_process_transfer", ("source_account_id", "destination_account_id")),
+    "deposit": ("_process_deposit", ("destination_account_id",)),
+    "withdrawal": ("_process_withdrawal", ("source_account_id",))
+}
+
 class FinancialBusinessRepository:
-    """Database repository for Financial Business plugin that handles all data operations"""
+    """
+    Database repository for Financial Business plugin that handles all data operations
+    
+    Expects an AsyncSession from database.connection.AsyncSessionLocal; that engine
+    keeps a pool of DB_POOL_SIZE asyncpg connections (plus DB_MAX_OVERFLOW) with
+    per-connection prepared statement caches, so the repository's fixed statements
+    are prepared once per connection.
+    """
     
     def __init__(self, session):
         """Initialize the repository with a database session"""
         self.session = session
+        self._transaction_handlers = {
+            transaction_type: (getattr(self, method), account_keys)
+            for transaction_type, (method, account_keys) in _TRANSACTION_HANDLERS.items()
+        }
     
     # Account Methods
     
@@ -31,7 +192,6 @@ class FinancialBusinessRepository:
             Account record or None if not found
         """
         try:
-            from . import models
             result = await self.session.get(models.Account, account_id)
             
             if not result:
@@ -44,36 +204,31 @@ class FinancialBusinessRepository:
             raise
     
     async def list_accounts(self, owner_id: Optional[int] = None, 
-                            limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+                            after_id: int = 0, limit: int = 100) -> Dict[str, Any]:
         """
-        List accounts with optional filtering
+        List accounts with optional filtering, paginated by account ID
         
         Args:
             owner_id: Optional owner ID filter
+            after_id: Return accounts with an ID greater than this (the previous page's next_after_id)
             limit: Maximum records to return
-            offset: Pagination offset
             
         Returns:
-            List of account records
+            Dictionary with the account records under "items" and the cursor for the
+            next page under "next_after_id" (None when the page is empty)
         """
         try:
-            from sqlalchemy import select
-            from . import models
-            
-            # Build query based on filters
-            query = select(models.Account)
-            if owner_id is not None:
-                query = query.where(models.Account.owner_id == owner_id)
-                
-            # Add pagination
-            query = query.offset(offset).limit(limit)
+            # Pick the cached statement for the filters in use
+            query = _list_accounts_stmt(owner_id is not None)
             
             # Execute query
-            result = await self.session.execute(query)
-            accounts = result.scalars().all()
+            result = await self.session.execute(
+                query, {"owner_id": owner_id, "after_id": after_id, "limit": limit}
+            )
             
             # Convert to dictionaries
-            return [self._account_to_dict(account) for account in accounts]
+            accounts = [self._account_to_dict(account) for account in result.scalars()]
+            return {"items": accounts, "next_after_id": accounts[-1]["id"] if accounts else None}
             
         except Exception as e:
             logger.error(f"Error listing accounts: {str(e)}")
@@ -90,11 +245,9 @@ class FinancialBusinessRepository:
             Created account record
         """
         try:
-            from . import models
-            
             # Generate account number if not provided
             if "account_number" not in account_data:
-                account_data["account_number"] = f"ACC{uuid.uuid4().hex[:8].upper()}"
+                account_data["account_number"] = f"ACC{secrets.token_hex(4).upper()}"
                 
             # Set defaults
             if "currency" not in account_data:
@@ -106,33 +259,32 @@ class FinancialBusinessRepository:
             if "status" not in account_data:
                 account_data["status"] = "active"
                 
-            # Create account object
-            account = models.Account(
-                account_number=account_data["account_number"],
-                balance=account_data["balance"],
-                currency=account_data["currency"],
-                owner_id=account_data["owner_id"],
-                account_type=account_data.get("account_type", "checking"),
-                status=account_data.get("status", "active"),
-                metadata=account_data.get("metadata")
+            # Insert and read back the row (including server defaults) in one round-trip
+            table = models.Account.__table__
+            result = await self.session.execute(
+                insert(table).values(
+                    account_number=account_data["account_number"],
+                    balance=account_data["balance"],
+                    currency=account_data["currency"],
+                    owner_id=account_data["owner_id"],
+                    account_type=account_data.get("account_type", "checking"),
+                    status=account_data.get("status", "active"),
+                    metadata=account_data.get("metadata")
+                ).returning(*table.c)
             )
+            account = self._account_to_dict(result.one())
             
-            # Add to session and commit
-            self.session.add(account)
-            await self.session.commit()
-            await self.session.refresh(account)
-            
-            # Audit the creation
-            await self._audit_log(
+            # Audit the creation in the same database transaction
+            await self._audit_log(AuditEvent(
                 action="create",
                 entity_type="account",
-                entity_id=str(account.id),
+                entity_id=str(account["id"]),
                 actor_id=account_data.get("created_by"),
-                actor_type="user",
-                details={"account_number": account.account_number}
-            )
+                details={"account_number": account["account_number"]}
+            ))
+            await self.session.commit()
             
-            return self._account_to_dict(account)
+            return account
             
         except Exception as e:
             await self.session.rollback()
@@ -151,8 +303,6 @@ class FinancialBusinessRepository:
             Updated account record
         """
         try:
-            from . import models
-            
             # Get the account
             account = await self.session.get(models.Account, account_id)
             if not account:
@@ -168,19 +318,16 @@ class FinancialBusinessRepository:
             if "metadata" in account_data:
                 account.metadata = account_data["metadata"]
                 
-            # Commit changes
-            await self.session.commit()
-            await self.session.refresh(account)
-            
-            # Audit the update
-            await self._audit_log(
+            # Audit the update and commit both together
+            await self._audit_log(AuditEvent(
                 action="update",
                 entity_type="account",
                 entity_id=str(account.id),
                 actor_id=account_data.get("updated_by"),
-                actor_type="user",
                 details={"updated_fields": list(account_data.keys())}
-            )
+            ))
+            await self.session.commit()
+            await self.session.refresh(account)
             
             return self._account_to_dict(account)
             
@@ -202,56 +349,55 @@ class FinancialBusinessRepository:
             Created transaction record
         """
         try:
-            from . import models
-            
             # Generate transaction reference
-            transaction_ref = transaction_data.get("transaction_ref") or f"TXN{uuid.uuid4().hex[:12].upper()}"
-            
-            # Create transaction object
-            transaction = models.Transaction(
-                transaction_ref=transaction_ref,
-                source_account_id=transaction_data.get("source_account_id"),
-                destination_account_id=transaction_data.get("destination_account_id"),
-                amount=transaction_data["amount"],
-                currency=transaction_data["currency"],
-                transaction_type=transaction_data["transaction_type"],
-                status=transaction_data.get("status", "pending"),
-                description=transaction_data.get("description"),
-                metadata=transaction_data.get("metadata")
-            )
-            
-            # Add to session
-            self.session.add(transaction)
-            
-            # Process the transaction based on type
-            if transaction.transaction_type == "transfer" and transaction.source_account_id and transaction.destination_account_id:
-                await self._process_transfer(
-                    source_id=transaction.source_account_id,
-                    destination_id=transaction.destination_account_id,
-                    amount=transaction.amount,
-                    transaction_id=transaction.id
-                )
-                transaction.status = "completed"
+            transaction_ref = transaction_data.get("transaction_ref") or f"TXN{secrets.token_hex(6).upper()}"
+            
+            # Transaction row to insert
+            payload = {
+                "transaction_ref": transaction_ref,
+                "source_account_id": transaction_data.get("source_account_id"),
+                "destination_account_id": transaction_data.get("destination_account_id"),
+                "amount": transaction_data["amount"],
+                "currency": transaction_data["currency"],
+                "transaction_type": transaction_data["transaction_type"],
+                "status": transaction_data.get("status", "pending"),
+                "description": transaction_data.get("description"),
+                "metadata": transaction_data.get("metadata")
+            }
             
-            # Commit changes
-            await self.session.commit()
-            await self.session.refresh(transaction)
+            # Move the money for types that have a handler and all the accounts it needs
+            handler = self._transaction_handlers.get(payload["transaction_type"])
+            if handler is not None:
+                process, account_keys = handler
+                account_ids = [payload[key] for key in account_keys]
+                if all(account_ids):
+                    await process(*account_ids, payload["amount"])
+                    payload["status"] = "completed"
+            
+            # Insert and read back the row (including server defaults) in one round-trip
+            table = models.Transaction.__table__
+            result = await self.session.execute(
+                insert(table).values(**payload).returning(*table.c)
+            )
+            transaction = self._transaction_to_dict(result.one())
             
-            # Audit the transaction
-            await self._audit_log(
+            # Audit the transaction in the same database transaction
+            await self._audit_log(AuditEvent(
                 action="create",
                 entity_type="transaction",
-                entity_id=str(transaction.id),
+                entity_id=str(transaction["id"]),
                 actor_id=transaction_data.get("created_by"),
-                actor_type="user",
                 details={
-                    "transaction_ref": transaction.transaction_ref,
-                    "amount": str(transaction.amount),
-                    "transaction_type": transaction.transaction_type
+                    "transaction_ref": transaction["transaction_ref"],
+                    "amount": str(payload["amount"]),
+                    "transaction_type": transaction["transaction_type"]
                 }
-            )
+            ))
+            
+            # Single commit for the transfer, the transaction and its audit entries
+            await self.session.commit()
             
-            return self._transaction_to_dict(transaction)
+            return transaction
             
         except Exception as e:
             await self.session.rollback()
@@ -269,7 +415,6 @@ class FinancialBusinessRepository:
             Transaction record or None if not found
         """
         try:
-            from . import models
             result = await self.session.get(models.Transaction, transaction_id)
             
             if not result:
@@ -292,31 +437,73 @@ class FinancialBusinessRepository:
             offset: Pagination offset
             
         Returns:
-            List of transaction records
+            List of transaction summaries (without description, metadata and updated_at)
         """
         try:
-            from sqlalchemy import select, or_
-            from . import models
+            # Transactions where the account is either source or destination
+            query = _list_account_transactions_stmt()
             
-            # Build query for transactions where the account is either source or destination
-            query = select(models.Transaction).where(
-                or_(
-                    models.Transaction.source_account_id == account_id,
-                    models.Transaction.destination_account_id == account_id
-                )
-            ).order_by(models.Transaction.created_at.desc()).offset(offset).limit(limit)
+            params = {"account_id": account_id, "offset": offset, "limit": limit, "window": offset + limit}
             
-            # Execute query
-            result = await self.session.execute(query)
-            transactions = result.scalars().all()
+            # Small pages are fetched in one go; large ones are read through a
+            # server-side cursor in yield_per batches and converted as they arrive
+            if limit < _STREAM_ROWS_THRESHOLD:
+                result = await self.session.execute(query, params)
+                return [self._transaction_summary_to_dict(row) for row in result]
             
-            # Convert to dictionaries
-            return [self._transaction_to_dict(txn) for txn in transactions]
+            transactions = []
+            stream = await self.session.stream(
+                query, params, execution_options={"yield_per": _STREAM_ROWS_THRESHOLD}
+            )
+            async for row in stream:
+                transactions.append(self._transaction_summary_to_dict(row))
+            return transactions
             
         except Exception as e:
             logger.error(f"Error listing transactions for account {account_id}: {str(e)}")
             raise
     
+    async def list_accounts_with_recent_transactions(self, owner_id: Optional[int] = None,
+                                                     after_id: int = 0, limit: int = 100,
+                                                     transactions_per_account: int = 10) -> Dict[str, Any]:
+        """
+        List accounts together with their most recent transactions
+        
+        Uses two queries for the whole page instead of one transactions query per account.
+        
+        Args:
+            owner_id: Optional owner ID to filter by
+            after_id: Return accounts with an ID greater than this (the previous page's next_after_id)
+            limit: Maximum accounts to return
+            transactions_per_account: Maximum transactions to include for each account
+            
+        Returns:
+            Same page shape as list_accounts, each account with a "transactions" list (newest first)
+        """
+        try:
+            page = await self.list_accounts(owner_id=owner_id, after_id=after_id, limit=limit)
+            accounts = page["items"]
+            if not accounts:
+                return page
+            
+            by_id = {}
+            for account in accounts:
+                account["transactions"] = []
+                by_id[account["id"]] = account["transactions"]
+            
+            result = await self.session.execute(
+                _recent_transactions_stmt(),
+                {"account_ids": list(by_id), "per_account": transactions_per_account}
+            )
+            for account_id, txn in result:
+                by_id[account_id].append(self._transaction_to_dict(txn))
+            
+            return page
+            
+        except Exception as e:
+            logger.error(f"Error listing accounts with transactions: {str(e)}")
+            raise
+    
     # Admin User Methods
     
     async def create_admin_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -330,34 +517,31 @@ class FinancialBusinessRepository:
             Created admin user record
         """
         try:
-            from . import models
-            
-            # Create admin user object
-            admin_user = models.AdminUser(
-                name=user_data["name"],
-                email=user_data["email"],
-                role=user_data.get("role", "admin"),
-                hashed_password=user_data["hashed_password"],
-                is_active=user_data.get("is_active", True),
-                permissions=user_data.get("permissions")
+            # Insert and read back the row (including server defaults) in one round-trip
+            table = models.AdminUser.__table__
+            result = await self.session.execute(
+                insert(table).values(
+                    name=user_data["name"],
+                    email=user_data["email"],
+                    role=user_data.get("role", "admin"),
+                    hashed_password=user_data["hashed_password"],
+                    is_active=user_data.get("is_active", True),
+                    permissions=user_data.get("permissions")
+                ).returning(*table.c)
             )
+            admin_user = self._admin_user_to_dict(result.one())
             
-            # Add to session and commit
-            self.session.add(admin_user)
-            await self.session.commit()
-            await self.session.refresh(admin_user)
-            
-            # Audit the creation
-            await self._audit_log(
+            # Audit the creation in the same database transaction
+            await self._audit_log(AuditEvent(
                 action="create",
                 entity_type="admin_user",
-                entity_id=str(admin_user.id),
+                entity_id=str(admin_user["id"]),
                 actor_id=user_data.get("created_by"),
-                actor_type="user",
-                details={"email": admin_user.email}
-            )
+                details={"email": admin_user["email"]}
+            ))
+            await self.session.commit()
             
-            return self._admin_user_to_dict(admin_user)
+            return admin_user
             
         except Exception as e:
             await self.session.rollback()
@@ -375,7 +559,6 @@ class FinancialBusinessRepository:
             Admin user record or None if not found
         """
         try:
-            from . import models
             result = await self.session.get(models.AdminUser, user_id)
             
             if not result:
@@ -399,14 +582,10 @@ class FinancialBusinessRepository:
             List of admin user records
         """
         try:
-            from sqlalchemy import select
-            from . import models
-            
-            # Build query
-            query = select(models.AdminUser).offset(offset).limit(limit)
-            
             # Execute query
-            result = await self.session.execute(query)
+            result = await self.session.execute(
+                _list_admin_users_stmt(), {"offset": offset, "limit": limit}
+            )
             users = result.scalars().all()
             
             # Convert to dictionaries
@@ -434,46 +613,86 @@ class FinancialBusinessRepository:
             Saved metric record
         """
         try:
-            from . import models
-            from sqlalchemy import select
-            
-            # Check if metric with same name and dimensions exists
-            query = select(models.Metric).where(
-                models.Metric.metric_name == metric_name
-            )
-            if dimensions:
-                query = query.where(models.Metric.dimensions == dimensions)
-                
-            result = await self.session.execute(query)
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                # Update existing metric
-                existing.metric_value = metric_value
-                existing.expiry = expiry
-                existing.timestamp = datetime.utcnow()
-                metric = existing
-            else:
-                # Create new metric
-                metric = models.Metric(
-                    metric_name=metric_name,
-                    metric_value=metric_value,
-                    dimensions=dimensions,
-                    expiry=expiry
-                )
-                self.session.add(metric)
-                
-            # Commit changes
+            stmt = self._metric_upsert_stmt([{
+                "metric_name": metric_name,
+                "metric_value": metric_value,
+                "dimensions": dimensions or {},
+                "expiry": expiry
+            }])
+            
+            result = await self.session.execute(stmt)
+            metric = self._metric_to_dict(result.one())
             await self.session.commit()
-            await self.session.refresh(metric)
             
-            return self._metric_to_dict(metric)
+            return metric
             
         except Exception as e:
             await self.session.rollback()
             logger.error(f"Error saving metric {metric_name}: {str(e)}")
             raise
     
+    async def save_metrics(self, metrics: List[Dict[str, Any]]) -> int:
+        """
+        Save many metric values with a single multi-row upsert
+        
+        Args:
+            metrics: Metric records with metric_name, metric_value and optional
+                dimensions and expiry
+            
+        Returns:
+            Number of metric series written
+        """
+        if not metrics:
+            return 0
+        
+        try:
+            # One row per series: the upsert can't touch the same row twice, so the
+            # last value for a repeated (metric_name, dimensions) wins
+            rows = {}
+            for metric in metrics:
+                dimensions = metric.get("dimensions") or {}
+                rows[(metric["metric_name"], orjson.dumps(dimensions, option=orjson.OPT_SORT_KEYS))] = {
+                    "metric_name": metric["metric_name"],
+                    "metric_value": metric["metric_value"],
+                    "dimensions": dimensions,
+                    "expiry": metric.get("expiry")
+                }
+            
+            await self.session.execute(self._metric_upsert_stmt(list(rows.values()), returning=False))
+            await self.session.commit()
+            
+            return len(rows)
+            
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error saving {len(metrics)} metrics: {str(e)}")
+            raise
+    
+    def _metric_upsert_stmt(self, rows: List[Dict[str, Any]], returning: bool = True):
+        """Build the (metric_name, dimensions) upsert for one or more metric rows"""
+        table = models.Metric.__table__
+        
+        # Metrics without dimensions are stored with {} so they still hit the unique
+        # index. Postgres keys the index on md5 of the canonical jsonb text instead
+        # of the JSON itself
+        if self.session.get_bind().dialect.name == "sqlite":
+            upsert = sqlite_insert
+            conflict_target = ["metric_name", "dimensions"]
+        else:
+            upsert = pg_insert
+            conflict_target = [table.c.metric_name, func.md5(cast(table.c.dimensions, Text))]
+        
+        stmt = upsert(table).values([{**row, "timestamp": func.now()} for row in rows])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=conflict_target,
+            set_={
+                "metric_value": stmt.excluded.metric_value,
+                "expiry": stmt.excluded.expiry,
+                "timestamp": func.now()
+            }
+        )
+        return stmt.returning(*table.c) if returning else stmt
+    
     async def get_metrics(self, metric_name: Optional[str] = None, 
                           dimensions: Optional[Dict[str, Any]] = None,
                           limit: int = 100) -> List[Dict[str, Any]]:
@@ -489,23 +708,13 @@ class FinancialBusinessRepository:
             List of metric records
         """
         try:
-            from sqlalchemy import select
-            from . import models
-            
-            # Build query based on filters
-            query = select(models.Metric)
-            if metric_name:
-                query = query.where(models.Metric.metric_name == metric_name)
-                
-            # Add dimensions filter if provided
-            if dimensions:
-                query = query.where(models.Metric.dimensions == dimensions)
-                
-            # Add limit
-            query = query.limit(limit)
+            # Pick the cached statement for the filters in use
+            query = _get_metrics_stmt(bool(metric_name), bool(dimensions))
             
             # Execute query
-            result = await self.session.execute(query)
+            result = await self.session.execute(
+                query, {"metric_name": metric_name, "dimensions": dimensions, "limit": limit}
+            )
             metrics = result.scalars().all()
             
             # Convert to dictionaries
@@ -515,135 +724,172 @@ class FinancialBusinessRepository:
             logger.error(f"Error getting metrics: {str(e)}")
             raise
     
-    # Audit Log Methods
-    
-    async def _audit_log(self, action: str, entity_type: str, entity_id: str,
-                        actor_id: Optional[int] = None, actor_type: str = "system",
-                        ip_address: Optional[str] = None, 
-                        details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def purge_expired_metrics(self) -> int:
         """
-        Create an audit log entry
+        Delete metrics whose expiry has passed
+        
+        Intended to run periodically so the metrics table only holds live series.
         
-        Args:
-            action: Action performed
-            entity_type: Type of entity
-            entity_id: Entity identifier
-            actor_id: ID of actor performing the action
-            actor_type: Type of actor (user, system, etc.)
-            ip_address: Optional IP address
-            details: Optional details
-            
         Returns:
-            Created audit log record
+            Number of metrics deleted
         """
         try:
-            from . import models
-            
-            # Create audit log object
-            audit_entry = models.AuditLog(
-                action=action,
-                entity_type=entity_type,
-                entity_id=entity_id,
-                actor_id=actor_id,
-                actor_type=actor_type,
-                ip_address=ip_address,
-                details=details
+            result = await self.session.execute(
+                delete(models.Metric.__table__).where(models.Metric.__table__.c.expiry <= func.now())
             )
-            
-            # Add to session and commit
-            self.session.add(audit_entry)
             await self.session.commit()
-            
-            return self._audit_to_dict(audit_entry)
+            return result.rowcount
             
         except Exception as e:
-            # Don't rollback the session here, as this is often called from other methods
-            logger.error(f"Error creating audit log: {str(e)}")
-            # Just log the error but don't raise, to avoid disrupting the main operation
-            return {
-                "error": str(e),
-                "action": action,
-                "entity_type": entity_type,
-                "entity_id": entity_id
-            }
+            await self.session.rollback()
+            logger.error(f"Error purging expired metrics: {str(e)}")
+            raise
+    
+    # Audit Log Methods
+    
+    async def _audit_log(self, *events: AuditEvent) -> None:
+        """
+        Insert audit log entries into the current database transaction
+        
+        Callers commit afterwards, so the entries are persisted (or rolled back)
+        together with the change they record.
+        
+        Args:
+            events: Audit entries to record
+        """
+        await self.session.execute(insert(models.AuditLog), [event.to_row() for event in events])
     
     # Helper methods to convert models to dictionaries
     
     def _account_to_dict(self, account) -> Dict[str, Any]:
         """Convert Account model to dictionary"""
+        (account_id, account_number, balance, currency, owner_id, account_type,
+         status, created_at, updated_at, metadata) = _account_values(account)
         return {
-            "id": account.id,
-            "account_number": account.account_number,
-            "balance": float(account.balance) if isinstance(account.balance, Decimal) else account.balance,
-            "currency": account.currency,
-            "owner_id": account.owner_id,
-            "account_type": account.account_type,
-            "status": account.status,
-            "created_at": account.created_at.isoformat() if account.created_at else None,
-            "updated_at": account.updated_at.isoformat() if account.updated_at else None,
-            "metadata": account.metadata
+            "id": account_id,
+            "account_number": account_number,
+            "balance": float(balance) if balance is not None else None,
+            "currency": currency,
+            "owner_id": owner_id,
+            "account_type": account_type,
+            "status": status,
+            "created_at": created_at and created_at.isoformat(),
+            "updated_at": updated_at and updated_at.isoformat(),
+            "metadata": metadata
         }
     
     def _transaction_to_dict(self, transaction) -> Dict[str, Any]:
         """Convert Transaction model to dictionary"""
+        (transaction_id, transaction_ref, source_account_id, destination_account_id, amount, currency,
+         transaction_type, status, description, created_at, updated_at, metadata) = _transaction_values(transaction)
         return {
-            "id": transaction.id,
-            "transaction_ref": transaction.transaction_ref,
-            "source_account_id": transaction.source_account_id,
-            "destination_account_id": transaction.destination_account_id,
-            "amount": float(transaction.amount) if isinstance(transaction.amount, Decimal) else transaction.amount,
-            "currency": transaction.currency,
-            "transaction_type": transaction.transaction_type,
-            "status": transaction.status,
-            "description": transaction.description,
-            "created_at": transaction.created_at.isoformat() if transaction.created_at else None,
-            "updated_at": transaction.updated_at.isoformat() if transaction.updated_at else None,
-            "metadata": transaction.metadata
+            "id": transaction_id,
+            "transaction_ref": transaction_ref,
+            "source_account_id": source_account_id,
+            "destination_account_id": destination_account_id,
+            "amount": float(amount) if amount is not None else None,
+            "currency": currency,
+            "transaction_type": transaction_type,
+            "status": status,
+            "description": description,
+            "created_at": created_at and created_at.isoformat(),
+            "updated_at": updated_at and updated_at.isoformat(),
+            "metadata": metadata
+        }
+    
+    def _transaction_summary_to_dict(self, row) -> Dict[str, Any]:
+        """Convert a list_account_transactions row to dictionary"""
+        (transaction_id, transaction_ref, source_account_id, destination_account_id, amount, currency,
+         transaction_type, status, created_at) = row
+        return {
+            "id": transaction_id,
+            "transaction_ref": transaction_ref,
+            "source_account_id": source_account_id,
+            "destination_account_id": destination_account_id,
+            "amount": float(amount) if amount is not None else None,
+            "currency": currency,
+            "transaction_type": transaction_type,
+            "status": status,
+            "created_at": created_at and created_at.isoformat()
         }
     
     def _admin_user_to_dict(self, admin_user) -> Dict[str, Any]:
         """Convert AdminUser model to dictionary"""
+        (user_id, name, email, role, is_active, last_login,
+         created_at, updated_at, permissions) = _admin_user_values(admin_user)
         return {
-            "id": admin_user.id,
-            "name": admin_user.name,
-            "email": admin_user.email,
-            "role": admin_user.role,
-            "is_active": admin_user.is_active,
-            "last_login": admin_user.last_login.isoformat() if admin_user.last_login else None,
-            "created_at": admin_user.created_at.isoformat() if admin_user.created_at else None,
-            "updated_at": admin_user.updated_at.isoformat() if admin_user.updated_at else None,
-            "permissions": admin_user.permissions
+            "id": user_id,
+            "name": name,
+            "email": email,
+            "role": role,
+            "is_active": is_active,
+            "last_login": last_login and last_login.isoformat(),
+            "created_at": created_at and created_at.isoformat(),
+            "updated_at": updated_at and updated_at.isoformat(),
+            "permissions": permissions
         }
     
     def _metric_to_dict(self, metric) -> Dict[str, Any]:
         """Convert Metric model to dictionary"""
+        metric_id, metric_name, metric_value, dimensions, timestamp, expiry = _metric_values(metric)
         return {
-            "id": metric.id,
-            "metric_name": metric.metric_name,
-            "metric_value": float(metric.metric_value) if isinstance(metric.metric_value, Decimal) else metric.metric_value,
-            "dimensions": metric.dimensions,
-            "timestamp": metric.timestamp.isoformat() if metric.timestamp else None,
-            "expiry": metric.expiry.isoformat() if metric.expiry else None
+            "id": metric_id,
+            "metric_name": metric_name,
+            "metric_value": float(metric_value) if metric_value is not None else None,
+            "dimensions": dimensions,
+            "timestamp": timestamp and timestamp.isoformat(),
+            "expiry": expiry and expiry.isoformat()
         }
     
     def _audit_to_dict(self, audit) -> Dict[str, Any]:
         """Convert AuditLog model to dictionary"""
+        (audit_id, action, entity_type, entity_id, actor_id, actor_type,
+         timestamp, ip_address, details) = _audit_values(audit)
         return {
-            "id": audit.id,
-            "action": audit.action,
-            "entity_type": audit.entity_type,
-            "entity_id": audit.entity_id,
-            "actor_id": audit.actor_id,
-            "actor_type": audit.actor_type,
-            "timestamp": audit.timestamp.isoformat() if audit.timestamp else None,
-            "ip_address": audit.ip_address,
-            "details": audit.details
+            "id": audit_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "actor_id": actor_id,
+            "actor_type": actor_type,
+            "timestamp": timestamp and timestamp.isoformat(),
+            "ip_address": ip_address,
+            "details": details
         }
     
     # Transaction processing
     
+    @staticmethod
+    def _debit_stmt(account_id: int, amount: Union[float, Decimal]):
+        """UPDATE that debits an account only while it holds enough funds"""
+        return update(models.Account).where(
+            models.Account.id == account_id,
+            models.Account.balance >= amount
+        ).values(balance=models.Account.balance - amount)
+    
+    @staticmethod
+    def _credit_stmt(account_id: int, amount: Union[float, Decimal]):
+        """UPDATE that credits an account"""
+        return update(models.Account).where(
+            models.Account.id == account_id
+        ).values(balance=models.Account.balance + amount)
+    
+    async def _apply_balance_change(self, stmt) -> bool:
+        """Run a balance UPDATE and report whether it matched the account"""
+        result = await self.session.execute(stmt.execution_options(synchronize_session=False))
+        return bool(result.rowcount)
+    
+    async def _raise_debit_error(self, source_id: int) -> None:
+        """Explain why a debit matched no row"""
+        exists = await self.session.scalar(
+            select(models.Account.id).where(models.Account.id == source_id)
+        )
+        if exists is None:
+            raise ValueError(f"Source account {source_id} not found")
+        raise ValueError(f"Insufficient funds in account {source_id}")
+    
     async def _process_transfer(self, source_id: int, destination_id: int, 
-                               amount: Union[float, Decimal], transaction_id: int) -> None:
+                               amount: Union[float, Decimal]) -> None:
         """
         Process a transfer between accounts
         
@@ -651,26 +897,42 @@ class FinancialBusinessRepository:
             source_id: Source account ID
             destination_id: Destination account ID
             amount: Transfer amount
-            transaction_id: Transaction ID
         """
-        from . import models
+        # Move the money in SQL so concurrent transfers can't lose updates; the
+        # debit only applies when the source still holds enough funds
+        debit = self._debit_stmt(source_id, amount)
+        credit = self._credit_stmt(destination_id, amount)
         
-        # Get the accounts
-        source_account = await self.session.get(models.Account, source_id)
-        destination_account = await self.session.get(models.Account, destination_id)
+        # Touch the rows in id order so opposite transfers can't deadlock
+        steps = [debit, credit] if source_id <= destination_id else [credit, debit]
         
-        if not source_account:
-            raise ValueError(f"Source account {source_id} not found")
-            
-        if not destination_account:
-            raise ValueError(f"Destination account {destination_id} not found")
-            
-        # Check if source account has sufficient funds
-        if source_account.balance < amount:
-            raise ValueError(f"Insufficient funds in account {source_id}")
-            
-        # Update balances
-        source_account.balance -= amount
-        destination_account.balance += amount
+        for stmt in steps:
+            if await self._apply_balance_change(stmt):
+                continue
+            if stmt is credit:
+                raise ValueError(f"Destination account {destination_id} not found")
+            await self._raise_debit_error(source_id)
         
         # No need to commit here, will be committed by the calling method
+    
+    async def _process_deposit(self, destination_id: int, amount: Union[float, Decimal]) -> None:
+        """
+        Process a deposit into an account
+        
+        Args:
+            destination_id: Destination account ID
+            amount: Deposit amount
+        """
+        if not await self._apply_balance_change(self._credit_stmt(destination_id, amount)):
+            raise ValueError(f"Destination account {destination_id} not found")
+    
+    async def _process_withdrawal(self, source_id: int, amount: Union[float, Decimal]) -> None:
+        """
+        Process a withdrawal from an account
+        
+        Args:
+            source_id: Source account ID
+            amount: Withdrawal amount
+        """
+        if not await self._apply_balance_change(self._debit_stmt(source_id, amount)):
+            await self._raise_debit_error(source_id)
@@ -4,19 +4,38 @@ Metrics endpoint for Financial Business Plugin
 from fastapi import APIRouter
 from starlette.responses import Response
 import logging
+import threading
+import time
 
 # Import our monitoring module
 from .monitoring import PROMETHEUS_AVAILABLE
 
+if PROMETHEUS_AVAILABLE:
+    from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
 router = APIRouter()
 logger = logging.getLogger("financial_business.metrics")
 
+# Rendered exposition is reused for this many seconds so concurrent scrapers
+# share one generate_latest() pass
+_METRICS_CACHE_TTL = 1.0
+_metrics_cache = {"ts": float("-inf"), "body": b""}
+_metrics_lock = threading.Lock()
+
+def _latest_metrics() -> bytes:
+    """Return the cached exposition, regenerating it once it is older than the TTL"""
+    with _metrics_lock:
+        now = time.monotonic()
+        if now - _metrics_cache["ts"] >= _METRICS_CACHE_TTL:
+            _metrics_cache["body"] = generate_latest()
+            _metrics_cache["ts"] = now
+        return _metrics_cache["body"]
+
 @router.get("/metrics", summary="Prometheus metrics endpoint for Financial Business Plugin")
 def metrics():
     """Returns Prometheus metrics for the Financial Business Plugin"""
     if PROMETHEUS_AVAILABLE:
-        from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
-        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+        return Response(_latest_metrics(), media_type=CONTENT_TYPE_LATEST)
     else:
         logger.warning("Prometheus client not available, returning empty metrics")
         return {"metrics": "Prometheus client not available"}
@@ -0,0 +1,47 @@
+"""
+Alembic migration script for financial_business plugin: store money as Numeric(19,4).
+
+Databases created from the plugin's ORM models before this revision have
+float balance/amount columns and no currency columns. This converts the money
+columns in place and adds the missing currency columns.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def _column_names(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+def upgrade():
+    # Convert existing rows in place
+    op.alter_column(
+        'accounts', 'balance',
+        type_=sa.Numeric(precision=19, scale=4),
+        existing_nullable=False,
+        postgresql_using='balance::numeric(19,4)'
+    )
+    op.alter_column(
+        'transactions', 'amount',
+        type_=sa.Numeric(precision=19, scale=4),
+        existing_nullable=False,
+        postgresql_using='amount::numeric(19,4)'
+    )
+    
+    # Currency lives on both tables so aggregates don't need a join
+    for table in ('accounts', 'transactions'):
+        if 'currency' not in _column_names(table):
+            op.add_column(table, sa.Column('currency', sa.String(8), nullable=False, server_default='USD'))
+
+def downgrade():
+    """Revert the money columns to float (currency columns are kept)"""
+    op.alter_column(
+        'transactions', 'amount',
+        type_=sa.Float,
+        existing_nullable=False,
+        postgresql_using='amount::double precision'
+    )
+    op.alter_column(
+        'accounts', 'balance',
+        type_=sa.Float,
+        existing_nullable=False,
+        postgresql_using='balance::double precision'
+    )
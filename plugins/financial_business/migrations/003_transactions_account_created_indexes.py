@@ -0,0 +1,48 @@
+"""
+Alembic migration script for financial_business plugin: composite account/recency indexes.
+
+"Recent transactions for account X" reads each side of the account
+separately, newest first, and merges the two (db_repository's
+_list_account_transactions_stmt). Composite indexes on
+(account, created_at DESC, id DESC) return each side already in page order,
+and carrying the rest of the listing's columns lets Postgres answer it with
+index-only scans instead of an index scan plus a sort. Their leading account
+column still serves plain account lookups and the foreign key checks, so
+they supersede the single-column source and destination indexes from 001,
+which are dropped to save a B-tree update on each insert.
+idx_transactions_created_at is kept for orderings across all accounts.
+
+The new indexes are built CONCURRENTLY before the old ones are dropped, also
+CONCURRENTLY, so reads keep an index and the table stays writable throughout.
+CONCURRENTLY can't run inside a transaction, hence the autocommit block.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Listing columns carried by both indexes; each also carries the other side's account
+_INCLUDE = ['transaction_ref', 'amount', 'currency', 'transaction_type', 'status']
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_tx_src_created', 'transactions',
+            ['source_account_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_include=_INCLUDE + ['destination_account_id'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_tx_dst_created', 'transactions',
+            ['destination_account_id', sa.text('created_at DESC'), sa.text('id DESC')],
+            postgresql_include=_INCLUDE + ['source_account_id'],
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_transactions_source', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('idx_transactions_destination', table_name='transactions', postgresql_concurrently=True)
+
+def downgrade():
+    """Restore the single-column indexes"""
+    with op.get_context().autocommit_block():
+        op.create_index('idx_transactions_source', 'transactions', ['source_account_id'], postgresql_concurrently=True)
+        op.create_index('idx_transactions_destination', 'transactions', ['destination_account_id'], postgresql_concurrently=True)
+        op.drop_index('idx_tx_dst_created', table_name='transactions', postgresql_concurrently=True)
+        op.drop_index('idx_tx_src_created', table_name='transactions', postgresql_concurrently=True)
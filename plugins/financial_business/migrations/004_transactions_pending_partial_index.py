@@ -0,0 +1,29 @@
+"""
+Alembic migration script for financial_business plugin: partial index on open transactions.
+
+Operational queries only look at transactions that haven't reached a terminal
+status, a small fraction of the table. A partial index over just those rows,
+ordered by created_at, stays small enough to live in cache, whereas the full
+idx_transactions_status from 001 mostly indexes completed rows; it is dropped.
+
+Built and dropped CONCURRENTLY inside an autocommit block, as in 003.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+_OPEN_STATUSES = sa.text("status IN ('pending', 'processing', 'failed_retry')")
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_tx_pending', 'transactions', ['created_at'],
+            postgresql_where=_OPEN_STATUSES,
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_transactions_status', table_name='transactions', postgresql_concurrently=True)
+
+def downgrade():
+    """Restore the full status index"""
+    with op.get_context().autocommit_block():
+        op.create_index('idx_transactions_status', 'transactions', ['status'], postgresql_concurrently=True)
+        op.drop_index('idx_tx_pending', table_name='transactions', postgresql_concurrently=True)
@@ -0,0 +1,101 @@
+"""
+Alembic migration script for financial_business plugin: partition audit_log by month.
+
+audit_log is append-only and read by time range, so it becomes a table
+partitioned by RANGE (timestamp) with one partition per month; the planner
+prunes months outside a query's range. The existing table is attached as the
+partition for everything up to the start of next month, so no rows are copied.
+A BRIN index on timestamp replaces the B-tree idx_audit_timestamp.
+
+Future partitions are created by ensure_audit_log_partition(month). The
+migration creates the next few months; schedule the function monthly (pg_cron or
+a post-deploy cron job), e.g.
+
+    SELECT ensure_audit_log_partition((date_trunc('month', now()) + interval '2 months')::date);
+
+A DEFAULT partition catches rows if the schedule falls behind, so audit writes never fail.
+"""
+from alembic import op
+from datetime import date
+
+# Monthly partitions created ahead by the migration
+_MONTHS_AHEAD = 3
+
+def _add_months(month: date, count: int) -> date:
+    total = month.year * 12 + month.month - 1 + count
+    return date(total // 12, total % 12 + 1, 1)
+
+def upgrade():
+    first_month = _add_months(date.today().replace(day=1), 1)
+    
+    # Keep the existing table (and its id sequence) to attach as the first partition
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_legacy")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY NONE")
+    op.execute("ALTER INDEX audit_log_pkey RENAME TO audit_log_legacy_pkey")
+    op.execute("ALTER INDEX idx_audit_entity RENAME TO idx_audit_legacy_entity")
+    op.execute("ALTER INDEX idx_audit_action RENAME TO idx_audit_legacy_action")
+    op.execute("DROP INDEX idx_audit_timestamp")
+    
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE audit_log (
+            id integer NOT NULL DEFAULT nextval('audit_log_id_seq'),
+            action varchar(64) NOT NULL,
+            entity_type varchar(64) NOT NULL,
+            entity_id varchar(64) NOT NULL,
+            actor_id integer,
+            actor_type varchar(32) NOT NULL,
+            timestamp timestamp NOT NULL DEFAULT now(),
+            ip_address varchar(64),
+            details json,
+            PRIMARY KEY (id, timestamp)
+        ) PARTITION BY RANGE (timestamp)
+    """)
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id")
+    
+    op.execute(f"""
+        ALTER TABLE audit_log ATTACH PARTITION audit_log_legacy
+        FOR VALUES FROM (MINVALUE) TO ('{first_month.isoformat()}')
+    """)
+    op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+    
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_audit_log_partition(month date) RETURNS void AS $$
+        DECLARE
+            start_date date := date_trunc('month', month)::date;
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+                'audit_log_' || to_char(start_date, 'YYYY_MM'),
+                start_date,
+                (start_date + interval '1 month')::date
+            );
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for offset in range(_MONTHS_AHEAD):
+        op.execute(f"SELECT ensure_audit_log_partition('{_add_months(first_month, offset).isoformat()}')")
+    
+    # Indexes on the parent cascade to every partition; the legacy partition's
+    # existing entity/action indexes are adopted rather than rebuilt
+    op.execute("CREATE INDEX idx_audit_entity ON audit_log (entity_type, entity_id)")
+    op.execute("CREATE INDEX idx_audit_action ON audit_log (action)")
+    op.execute("CREATE INDEX idx_audit_brin ON audit_log USING BRIN (timestamp) WITH (pages_per_range = 32)")
+
+def downgrade():
+    """Collapse the partitions back into a single audit_log table"""
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY NONE")
+    op.execute("DROP INDEX idx_audit_entity, idx_audit_action, idx_audit_brin")
+    op.execute("""
+        CREATE TABLE audit_log (LIKE audit_log_partitioned INCLUDING DEFAULTS)
+    """)
+    op.execute("INSERT INTO audit_log SELECT * FROM audit_log_partitioned")
+    op.execute("DROP TABLE audit_log_partitioned CASCADE")
+    op.execute("ALTER TABLE audit_log ADD PRIMARY KEY (id)")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id")
+    op.execute("DROP FUNCTION ensure_audit_log_partition(date)")
+    
+    op.create_index('idx_audit_entity', 'audit_log', ['entity_type', 'entity_id'])
+    op.create_index('idx_audit_timestamp', 'audit_log', ['timestamp'])
+    op.create_index('idx_audit_action', 'audit_log', ['action'])
@@ -0,0 +1,23 @@
+"""
+Alembic migration script for financial_business plugin: index metrics by expiry.
+
+save_metric upserts one row per (metric_name, dimensions), so the metrics table
+holds current values rather than an append-only series; retention means deleting
+rows past their expiry. A partial index over the rows that have an expiry keeps
+that periodic purge a range scan.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_metrics_expiry', 'metrics', ['expiry'],
+            postgresql_where=sa.text('expiry IS NOT NULL'),
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    """Drop the expiry index"""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_metrics_expiry', table_name='metrics', postgresql_concurrently=True)
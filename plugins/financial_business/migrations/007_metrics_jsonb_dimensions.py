@@ -0,0 +1,32 @@
+"""
+Alembic migration script for financial_business plugin: jsonb metric dimensions.
+
+The (metric_name, dimensions) uniqueness used by save_metric's upsert was
+declared over a json column, which Postgres can't compare for equality. The
+column becomes jsonb (whose text form is canonical, so equal dimensions always
+render the same) and uniqueness moves to an expression index on
+md5(dimensions::text), a 16-byte key instead of the whole document.
+
+The timestamp is deliberately not part of the key: save_metric keeps one current
+row per metric series rather than appending samples.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+def upgrade():
+    op.execute("UPDATE metrics SET dimensions = '{}' WHERE dimensions IS NULL")
+    op.alter_column(
+        'metrics', 'dimensions',
+        type_=postgresql.JSONB,
+        nullable=False,
+        server_default=sa.text("'{}'::jsonb"),
+        postgresql_using='dimensions::jsonb'
+    )
+    op.execute("ALTER TABLE metrics DROP CONSTRAINT IF EXISTS uq_metrics_name_dimensions")
+    op.execute("CREATE UNIQUE INDEX uq_metrics_nd ON metrics (metric_name, md5(dimensions::text))")
+
+def downgrade():
+    """Restore the column-level unique constraint (the column stays jsonb, as json can't back one)"""
+    op.execute("DROP INDEX uq_metrics_nd")
+    op.create_unique_constraint('uq_metrics_name_dimensions', 'metrics', ['metric_name', 'dimensions'])
@@ -0,0 +1,57 @@
+"""
+Alembic migration script for financial_business plugin: jsonb metadata columns.
+
+The free-form accounts.metadata, transactions.metadata, admin_users.permissions
+and audit_log.details columns were created as json, which Postgres stores as
+text and reparses on every access and can't index. They become jsonb, and the
+two that are filtered on (transaction metadata and audit details) get GIN
+indexes so containment lookups such as metadata @> '{"region": "EU"}' are
+index-backed. jsonb_path_ops indexes are a fraction of the size of the default
+operator class and cover @>, which is the only operator those lookups need.
+
+The transactions index is built CONCURRENTLY; audit_log is partitioned (005),
+which doesn't support it, so its index is created on the parent and cascades
+to every partition.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+_COLUMNS = [
+    ('accounts', 'metadata'),
+    ('admin_users', 'permissions'),
+    ('transactions', 'metadata'),
+    ('audit_log', 'details'),
+]
+
+def upgrade():
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB,
+            postgresql_using=f'{column}::jsonb'
+        )
+    op.create_index(
+        'idx_audit_details_gin', 'audit_log', ['details'],
+        postgresql_using='gin',
+        postgresql_ops={'details': 'jsonb_path_ops'}
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_tx_meta_gin', 'transactions', ['metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    """Drop the GIN indexes and restore the json columns"""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_tx_meta_gin', table_name='transactions', postgresql_concurrently=True)
+    op.drop_index('idx_audit_details_gin', table_name='audit_log')
+    for table, column in _COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.JSON,
+            postgresql_using=f'{column}::json'
+        )
@@ -0,0 +1,28 @@
+"""
+Alembic migration script for financial_business plugin: audit entity/recency index.
+
+The dominant audit query is "activity for entity X, most recent first". With
+idx_audit_entity on (entity_type, entity_id) Postgres fetches every row for the
+entity and then sorts them. Appending timestamp DESC to the equality columns
+returns them already ordered, and carrying action and actor_id lets the usual
+listing be answered from the index alone. It supersedes idx_audit_entity, which
+is dropped.
+
+audit_log is partitioned (005), so the index is created on the parent and
+cascades to every partition; CONCURRENTLY isn't available there.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_index(
+        'idx_audit_entity_ts', 'audit_log',
+        ['entity_type', 'entity_id', sa.text('timestamp DESC')],
+        postgresql_include=['action', 'actor_id']
+    )
+    op.drop_index('idx_audit_entity', table_name='audit_log')
+
+def downgrade():
+    """Restore the plain entity index"""
+    op.create_index('idx_audit_entity', 'audit_log', ['entity_type', 'entity_id'])
+    op.drop_index('idx_audit_entity_ts', table_name='audit_log')
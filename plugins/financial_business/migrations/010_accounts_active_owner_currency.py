@@ -0,0 +1,65 @@
+"""
+Alembic migration script for financial_business plugin: account integrity constraints.
+
+An owner may hold at most one active account per currency. A partial unique
+index over (owner_id, currency) restricted to active rows enforces that in the
+database, race-free and without a lookup before each insert; closed or frozen
+accounts are outside the predicate and don't count. A CHECK constraint keeps
+balances from going negative whatever path writes them.
+
+Existing rows that break either rule would fail the migration halfway with a
+bare constraint error, so they are looked for first and reported by account.
+The CHECK is added NOT VALID, which applies to new writes at once, and then
+validated in a separate transaction, whose scan of the existing rows doesn't
+block writes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# How many offending rows of each kind the error lists
+_REPORT_LIMIT = 20
+
+def _check_existing_rows():
+    bind = op.get_bind()
+    duplicates = bind.execute(sa.text("""
+        SELECT owner_id, currency, array_agg(id ORDER BY id) AS account_ids
+        FROM accounts
+        WHERE status = 'active'
+        GROUP BY owner_id, currency
+        HAVING count(*) > 1
+        LIMIT :limit
+    """), {"limit": _REPORT_LIMIT}).all()
+    negative = bind.execute(sa.text(
+        "SELECT id, balance FROM accounts WHERE balance < 0 ORDER BY id LIMIT :limit"
+    ), {"limit": _REPORT_LIMIT}).all()
+    
+    problems = [
+        f"owner {owner_id} has several active {currency} accounts: {', '.join(map(str, account_ids))}"
+        for owner_id, currency, account_ids in duplicates
+    ] + [
+        f"account {account_id} has a negative balance ({balance})"
+        for account_id, balance in negative
+    ]
+    if problems:
+        raise RuntimeError(
+            "Fix these accounts before adding the account integrity constraints "
+            f"(up to {_REPORT_LIMIT} of each kind are listed):\n  " + "\n  ".join(problems)
+        )
+
+def upgrade():
+    _check_existing_rows()
+    op.create_index(
+        'uq_accounts_owner_currency_active', 'accounts',
+        ['owner_id', 'currency'],
+        unique=True,
+        postgresql_where=sa.text("status = 'active'")
+    )
+    op.execute("ALTER TABLE accounts ADD CONSTRAINT ck_accounts_balance_nonneg CHECK (balance >= 0) NOT VALID")
+    # Validated in its own transaction so the ADD's exclusive lock is already released
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE accounts VALIDATE CONSTRAINT ck_accounts_balance_nonneg")
+
+def downgrade():
+    """Drop the account integrity constraints"""
+    op.drop_constraint('ck_accounts_balance_nonneg', 'accounts', type_='check')
+    op.drop_index('uq_accounts_owner_currency_active', table_name='accounts')
@@ -0,0 +1,42 @@
+"""
+Alembic migration script for financial_business plugin: updated_at trigger.
+
+001 declared onupdate=now() on the updated_at columns, but onupdate is a
+client-side SQLAlchemy default that a migration can't install, and the
+repository's UPDATEs run against the bare tables, so updated_at never moved
+after the insert. A shared BEFORE UPDATE trigger now stamps it in the
+database, once per row, whatever path issues the UPDATE.
+
+The column defaults become CURRENT_TIMESTAMP. Like now(), it returns the
+transaction start time, so created_at and updated_at on a fresh row are
+identical.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+_TABLES = ['accounts', 'admin_users', 'transactions']
+
+def upgrade():
+    op.execute("""
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := CURRENT_TIMESTAMP;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in _TABLES:
+        op.alter_column(table, 'created_at', server_default=sa.text('CURRENT_TIMESTAMP'))
+        op.alter_column(table, 'updated_at', server_default=sa.text('CURRENT_TIMESTAMP'))
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+def downgrade():
+    """Drop the triggers and restore the now() defaults"""
+    for table in _TABLES:
+        op.execute(f"DROP TRIGGER trg_{table}_updated_at ON {table}")
+        op.alter_column(table, 'updated_at', server_default=sa.func.now())
+        op.alter_column(table, 'created_at', server_default=sa.func.now())
+    op.execute("DROP FUNCTION set_updated_at()")
@@ -1,24 +1,29 @@
 """
 SQLAlchemy models for the Financial Business App plugin.
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Numeric, ForeignKey, DateTime, select
+from sqlalchemy.orm import relationship, selectinload
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
+# Relationships use lazy="raise_on_sql": touching one that wasn't loaded up front
+# raises instead of silently issuing a query per row. Load them explicitly with
+# selectinload/joinedload, e.g. via account_with_transactions_query().
+
 class Account(Base):
     __tablename__ = "accounts"
 
     id = Column(Integer, primary_key=True, index=True)
     account_number = Column(String, unique=True, index=True, nullable=False)
-    balance = Column(Float, nullable=False, default=0.0)
+    balance = Column(Numeric(19, 4), nullable=False, default=0)
+    currency = Column(String(8), nullable=False, default="USD")
     owner_id = Column(Integer, ForeignKey("admin_users.id")) # Assuming admin_users are owners for now
 
-    owner = relationship("AdminUser", back_populates="accounts")
-    outgoing_transactions = relationship("Transaction", foreign_keys="Transaction.from_account_id", back_populates="from_account")
-    incoming_transactions = relationship("Transaction", foreign_keys="Transaction.to_account_id", back_populates="to_account")
+    owner = relationship("AdminUser", back_populates="accounts", lazy="raise_on_sql")
+    outgoing_transactions = relationship("Transaction", foreign_keys="Transaction.from_account_id", back_populates="from_account", lazy="raise_on_sql")
+    incoming_transactions = relationship("Transaction", foreign_keys="Transaction.to_account_id", back_populates="to_account", lazy="raise_on_sql")
 
 class AdminUser(Base):
     __tablename__ = "admin_users"
@@ -28,18 +33,26 @@ class AdminUser(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String) # Store hashed passwords, not plain text
 
-    accounts = relationship("Account", back_populates="owner")
+    accounts = relationship("Account", back_populates="owner", lazy="raise_on_sql")
 
 class Transaction(Base):
     __tablename__ = "transactions"
     
     id = Column(Integer, primary_key=True, index=True)
-    from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
-    to_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
-    amount = Column(Float, nullable=False)
+    from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    to_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    amount = Column(Numeric(19, 4), nullable=False)
+    currency = Column(String(8), nullable=False, default="USD")
     timestamp = Column(DateTime, default=datetime.utcnow)
     status = Column(String, default="completed")
     description = Column(String, nullable=True)
     
-    from_account = relationship("Account", foreign_keys=[from_account_id], back_populates="outgoing_transactions")
-    to_account = relationship("Account", foreign_keys=[to_account_id], back_populates="incoming_transactions")
+    from_account = relationship("Account", foreign_keys=[from_account_id], back_populates="outgoing_transactions", lazy="raise_on_sql")
+    to_account = relationship("Account", foreign_keys=[to_account_id], back_populates="incoming_transactions", lazy="raise_on_sql")
+
+def account_with_transactions_query(account_id: int):
+    """Select an account with its outgoing and incoming transactions eagerly loaded"""
+    return select(Account).where(Account.id == account_id).options(
+        selectinload(Account.outgoing_transactions),
+        selectinload(Account.incoming_transactions)
+    )
@@ -2,8 +2,16 @@
 Monitoring utilities for Financial Business Plugin
 """
 import logging
+from bisect import bisect_left
+from collections import deque
 from typing import Dict, Any, Optional
 
+# Observations kept by MockSummary; older ones are dropped
+MOCK_SUMMARY_WINDOW = 4096
+
+# Same upper bounds as prometheus_client's default histogram buckets
+DEFAULT_BUCKETS = (.005, .01, .025, .05, .075, .1, .25, .5, .75, 1.0, 2.5, 5.0, 7.5, 10.0, float("inf"))
+
 # Set up logger
 logger = logging.getLogger("financial_business.monitoring")
 
@@ -18,7 +26,8 @@ class MockCounter:
     
     def inc(self, value: float = 1):
         self.value += value
-        logger.debug(f"Incremented {self.name}: {self.value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Incremented {self.name}: {self.value}")
     
     def labels(self, **kwargs):
         return self
@@ -28,27 +37,38 @@ class MockSummary:
         self.name = name
         self.description = description
         self.labels_schema = labels or []
-        self.values = []
+        self.values = deque(maxlen=MOCK_SUMMARY_WINDOW)
         logger.info(f"Created mock summary: {name}")
     
     def observe(self, value: float):
         self.values.append(value)
-        logger.debug(f"Observed {self.name}: {value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Observed {self.name}: {value}")
     
     def labels(self, **kwargs):
         return self
 
 class MockHistogram:
-    def __init__(self, name: str, description: str, labels: Optional[list] = None):
+    def __init__(self, name: str, description: str, labels: Optional[list] = None,
+                 buckets: Optional[tuple] = None):
         self.name = name
         self.description = description
         self.labels_schema = labels or []
-        self.values = []
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+        if self.buckets[-1] != float("inf"):
+            self.buckets += (float("inf"),)
+        # Per-bucket counts (non-cumulative) instead of every raw observation
+        self.bucket_counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
         logger.info(f"Created mock histogram: {name}")
     
     def observe(self, value: float):
-        self.values.append(value)
-        logger.debug(f"Observed {self.name}: {value}")
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Observed {self.name}: {value}")
     
     def labels(self, **kwargs):
         return self
@@ -63,15 +83,18 @@ class MockGauge:
     
     def set(self, value: float):
         self.value = value
-        logger.debug(f"Set {self.name}: {value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Set {self.name}: {value}")
         
     def inc(self, value: float = 1):
         self.value += value
-        logger.debug(f"Incremented {self.name}: {self.value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Incremented {self.name}: {self.value}")
         
     def dec(self, value: float = 1):
         self.value -= value
-        logger.debug(f"Decremented {self.name}: {self.value}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Decremented {self.name}: {self.value}")
     
     def labels(self, **kwargs):
         return self
@@ -94,3 +117,9 @@ FINANCIAL_TRANSFER_COUNT = Counter('financial_transfer_count', 'Number of financ
 FINANCIAL_TRANSFER_AMOUNT = Summary('financial_transfer_amount', 'Transfer amounts')
 FINANCIAL_TRANSFER_ERRORS = Counter('financial_transfer_errors', 'Transfer errors', ['error_type'])
 DB_QUERY_LATENCY = Summary('db_query_latency_seconds', 'Database query latency')
+
+# Transfer error types are a small fixed set, so their children are bound once
+TRANSFER_ERR = {
+    error_type: FINANCIAL_TRANSFER_ERRORS.labels(error_type=error_type)
+    for error_type in ("account_not_found", "insufficient_funds", "unexpected_error")
+}
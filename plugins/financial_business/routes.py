@@ -4,6 +4,7 @@ API routes for Financial Business App plugin
 from fastapi import APIRouter, Body, Query, Depends, HTTPException
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
+from decimal import Decimal
 import logging
 import time
 import asyncio
@@ -11,6 +12,7 @@ import asyncio
 # Handle missing SQLAlchemy imports gracefully
 try:
     from sqlalchemy import select, update
+    from sqlalchemy.exc import IntegrityError
     from sqlalchemy.ext.asyncio import AsyncSession
     from sqlalchemy.orm import joinedload
     SQLALCHEMY_AVAILABLE = True
@@ -18,6 +20,7 @@ except ImportError:
     logging.warning("SQLAlchemy not available, using mock implementations")
     select = lambda *args: None
     update = lambda *args: None
+    class IntegrityError(Exception): pass
     class AsyncSession: pass
     joinedload = lambda *args: None
     SQLALCHEMY_AVAILABLE = False
@@ -76,7 +79,13 @@ async def get_db():
 async def create_account(account: schemas.AccountCreate, db: AsyncSession = Depends(get_db)):
     db_account = models.Account(account_number=account.account_number, balance=account.balance, owner_id=account.owner_id)
     db.add(db_account)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Duplicate account number, or a second active account for the same
+        # owner and currency (enforced by uq_accounts_owner_currency_active)
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Account conflicts with an existing account")
     await db.refresh(db_account)
     return db_account
 
@@ -134,9 +143,9 @@ async def list_admin_users_db(skip: int = 0, limit: int = 100, db: AsyncSession
 from .monitoring import (
     FINANCIAL_TRANSFER_COUNT, 
     FINANCIAL_TRANSFER_AMOUNT, 
-    FINANCIAL_TRANSFER_ERRORS, 
     DB_QUERY_LATENCY,
-    PROMETHEUS_AVAILABLE
+    PROMETHEUS_AVAILABLE,
+    TRANSFER_ERR
 )
 
 # Set flag for whether monitoring is available
@@ -192,33 +201,36 @@ async def create_transfer(transfer: schemas.TransferCreate, db: AsyncSession = D
                     error_msg = f"Sender account {transfer.from_account_id} not found"
                     logger.warning(f"Transfer failed: {error_msg}")
                     if MONITORING_AVAILABLE:
-                        FINANCIAL_TRANSFER_ERRORS.labels(error_type="account_not_found").inc()
+                        TRANSFER_ERR["account_not_found"].inc()
                     raise HTTPException(status_code=404, detail=error_msg)
                     
                 if to_acc is None:
                     error_msg = f"Receiver account {transfer.to_account_id} not found"
                     logger.warning(f"Transfer failed: {error_msg}")
                     if MONITORING_AVAILABLE:
-                        FINANCIAL_TRANSFER_ERRORS.labels(error_type="account_not_found").inc()
+                        TRANSFER_ERR["account_not_found"].inc()
                     raise HTTPException(status_code=404, detail=error_msg)
                 
+                # Balances are Numeric columns, so do the money math in Decimal
+                amount = Decimal(str(transfer.amount))
+                
                 # Check sufficient funds
-                if from_acc.balance < transfer.amount:
+                if from_acc.balance < amount:
                     error_msg = "Insufficient funds"
                     logger.warning(f"Transfer failed: {error_msg} - Account {transfer.from_account_id} has {from_acc.balance}, needed {transfer.amount}")
                     if MONITORING_AVAILABLE:
-                        FINANCIAL_TRANSFER_ERRORS.labels(error_type="insufficient_funds").inc()
+                        TRANSFER_ERR["insufficient_funds"].inc()
                     raise HTTPException(status_code=400, detail=error_msg)
                 
                 # Update balances
-                from_acc.balance -= transfer.amount
-                to_acc.balance += transfer.amount
+                from_acc.balance -= amount
+                to_acc.balance += amount
                 
                 # Create transaction record
                 transaction = models.Transaction(
                     from_account_id=transfer.from_account_id,
                     to_account_id=transfer.to_account_id,
-                    amount=transfer.amount,
+                    amount=amount,
                     description=transfer.description,
                     timestamp=datetime.utcnow(),
                     status="completed"
@@ -259,7 +271,7 @@ async def create_transfer(transfer: schemas.TransferCreate, db: AsyncSession = D
         
         # Record error metric if monitoring is available
         if MONITORING_AVAILABLE:
-            FINANCIAL_TRANSFER_ERRORS.labels(error_type="unexpected_error").inc()
+            TRANSFER_ERR["unexpected_error"].inc()
             
         # Return a proper error response
         raise HTTPException(status_code=500, detail="An unexpected error occurred during transfer processing")
@@ -3,13 +3,15 @@ API Key Management Routes
 Provides endpoints for managing external service API keys and integrations
 """
 
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 
-from database.connection import get_db_session
-from api.services.api_key_service import APIKeyService, INTEGRATION_DEFINITIONS
+from database.connection import get_db_session, get_async_db_session, db_session, async_engine
+from api.services.api_key_service import APIKeyService, AsyncAPIKeyService, INTEGRATION_DEFINITIONS
 from api.models.api_keys import APIKeyManager, IntegrationConfig
 
 router = APIRouter(prefix="/integrations", tags=["integrations"])
@@ -53,6 +55,20 @@ def get_db():
     return next(get_db_session())
 
 
+async def get_async_db():
+    """Async session for read-only routes, or None when the database has no async driver"""
+    if async_engine is None:
+        yield None
+        return
+    async for session in get_async_db_session():
+        yield session
+
+
+def _list_api_keys_sync(category: Optional[str]) -> List[Dict[str, Any]]:
+    with db_session() as db:
+        return APIKeyService(db).list_api_keys(category=category)
+
+
 @router.post("/api-keys", response_model=Dict[str, Any])
 async def create_api_key(
     api_key_data: APIKeyCreate,
@@ -86,12 +102,14 @@ async def create_api_key(
 @router.get("/api-keys", response_model=List[APIKeyResponse])
 async def list_api_keys(
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Optional[AsyncSession] = Depends(get_async_db)
 ):
     """List all configured API keys (without exposing actual keys)"""
     try:
-        service = APIKeyService(db)
-        keys = service.list_api_keys(category=category)
+        if db is None:
+            keys = await asyncio.to_thread(_list_api_keys_sync, category)
+        else:
+            keys = await AsyncAPIKeyService(db).list_api_keys(category=category)
         
         return [
             APIKeyResponse(
@@ -273,7 +291,8 @@ async def generate_environment_file(
     """Generate environment file with all configured API keys"""
     try:
         service = APIKeyService(db)
-        env_content = service.generate_env_file(environment=config.environment)
+        # Bulk key decryption runs off the event loop
+        env_content = await asyncio.to_thread(service.generate_env_file, environment=config.environment)
         
         return {
             "success": True,
@@ -37,8 +37,10 @@ async def list_plugins(db: Session = Depends(get_db_session)):
             if os.path.exists(manifest_path):
                 with open(manifest_path, "r") as f:
                     manifest = json.load(f)
+                # The response_model validates the returned list once, so the
+                # per-plugin models are built without a second validation pass
                 plugins.append(
-                    PluginRead(
+                    PluginRead.model_construct(
                         id=plugin_name,
                         name=manifest.get("name", plugin_name),
                         version=manifest.get("version", "0.0.0"),
@@ -87,7 +89,8 @@ async def upload_plugin(
             plugin_dir = os.path.join(settings.PLUGIN_DIR, manifest_data["name"])
             zip_ref.extractall(plugin_dir)
         
-        return PluginRead(
+        # Validated once against the response_model on the way out
+        return PluginRead.model_construct(
             id=manifest_data["name"],
             name=manifest_data["name"],
             version=manifest_data["version"],
@@ -145,7 +148,7 @@ async def enable_plugin(
     
     # TODO: Actually enable the plugin in the system
     
-    return PluginRead(
+    return PluginRead.model_construct(
         id=plugin_id,
         name=manifest.get("name", plugin_id),
         version=manifest.get("version", "0.0.0"),
@@ -175,7 +178,7 @@ async def disable_plugin(
     
     # TODO: Actually disable the plugin in the system
     
-    return PluginRead(
+    return PluginRead.model_construct(
         id=plugin_id,
         name=manifest.get("name", plugin_id),
         version=manifest.get("version", "0.0.0"),
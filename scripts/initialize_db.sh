@@ -18,4 +18,7 @@ alembic upgrade head
 # Create initial user if needed
 python -m scripts.create_admin_user
 
+# Rewrite any API keys still in the legacy encryption format
+python -m scripts.migrate_legacy_api_keys
+
 echo "Database initialization complete!"
@@ -0,0 +1,25 @@
+"""
+Re-encrypt API keys stored in the legacy base64-wrapped format.
+"""
+import sys
+import os
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.connection import db_session
+from services.api_key_service import APIKeyService
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Rewrite legacy API key tokens as raw Fernet tokens"""
+    logger.info("Checking for legacy-encoded API keys...")
+    
+    with db_session() as db:
+        migrated = APIKeyService(db).migrate_legacy_api_keys()
+    
+    logger.info(f"Re-encrypted {migrated} legacy API key(s)")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,8 @@ Handles integration management and API key operations
 """
 
 from typing import Dict, List, Optional, Any
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from api.models.api_keys import APIKeyManager, IntegrationConfig, DeploymentEnvironment
 from database.connection import get_db_session
@@ -13,6 +15,20 @@ import os
 from datetime import datetime
 
 
+def _api_key_summary(entry: APIKeyManager) -> Dict[str, Any]:
+    """API key listing entry (without the actual key)"""
+    return {
+        "id": entry.id,
+        "service_name": entry.service_name,
+        "service_category": entry.service_category,
+        "description": entry.description,
+        "has_key": bool(entry.api_key),
+        "configuration": entry.configuration,
+        "created_at": entry.created_at,
+        "updated_at": entry.updated_at
+    }
+
+
 class APIKeyService:
     """Service for managing API keys and integrations"""
     
@@ -92,19 +108,21 @@ class APIKeyService:
         
         entries = query.all()
         
-        return [
-            {
-                "id": entry.id,
-                "service_name": entry.service_name,
-                "service_category": entry.service_category,
-                "description": entry.description,
-                "has_key": bool(entry.api_key),
-                "configuration": entry.configuration,
-                "created_at": entry.created_at,
-                "updated_at": entry.updated_at
-            }
-            for entry in entries
-        ]
+        return [_api_key_summary(entry) for entry in entries]
+    
+    def migrate_legacy_api_keys(self) -> int:
+        """Re-encrypt keys stored in the legacy base64-wrapped format as raw Fernet tokens"""
+        migrated = 0
+        for entry in self.db.query(APIKeyManager).all():
+            if entry.has_legacy_encoding():
+                plain_key = entry.decrypt_api_key()
+                if plain_key:
+                    entry.set_api_key(plain_key)
+                    migrated += 1
+        
+        if migrated:
+            self.db.commit()
+        return migrated
     
     def delete_api_key(self, service_name: str) -> bool:
         """Delete an API key"""
@@ -242,8 +260,7 @@ class APIKeyService:
         ])
         
         # Add API keys
-        for api_key in api_keys:
-            decrypted_key = api_key.get_api_key()
+        for api_key, decrypted_key in zip(api_keys, APIKeyManager.bulk_decrypt(api_keys)):
             env_lines.append(f"{api_key.service_name.upper()}_API_KEY={decrypted_key}")
             
             # Add any additional configuration
@@ -273,6 +290,47 @@ class APIKeyService:
         return "\n".join(env_lines)
 
 
+class AsyncAPIKeyService:
+    """Read-only API key lookups on an async session-per-request"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _get_active_entry(self, service_name: str) -> Optional[APIKeyManager]:
+        result = await self.db.execute(
+            select(APIKeyManager).where(
+                APIKeyManager.service_name == service_name,
+                APIKeyManager.is_active == True
+            ).limit(1)
+        )
+        return result.scalars().first()
+    
+    async def get_api_key(self, service_name: str) -> Optional[str]:
+        """Get decrypted API key for a service"""
+        entry = await self._get_active_entry(service_name)
+        if entry:
+            return entry.get_api_key()
+        return None
+    
+    async def get_service_config(self, service_name: str) -> Optional[Dict[str, Any]]:
+        """Get configuration for a service"""
+        entry = await self._get_active_entry(service_name)
+        if entry:
+            return entry.configuration
+        return None
+    
+    async def list_api_keys(self, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List all API keys (without exposing the actual keys)"""
+        query = select(APIKeyManager).where(APIKeyManager.is_active == True)
+        
+        if category:
+            query = query.where(APIKeyManager.service_category == category)
+        
+        result = await self.db.execute(query)
+        
+        return [_api_key_summary(entry) for entry in result.scalars()]
+
+
 # Pre-defined integration configurations
 INTEGRATION_DEFINITIONS = {
     "openai": {
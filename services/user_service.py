@@ -247,7 +247,8 @@ class UserService:
         # Calculate expiration time in seconds for client reference
         expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         
-        return Token(
+        # Every field is generated here, so skip validation
+        return Token.model_construct(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
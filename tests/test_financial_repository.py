@@ -0,0 +1,275 @@
+"""
+Unit tests for the Financial Business repository
+
+The plugin's ORM models predate the migrated schema the repository writes to,
+so the tables are declared here from migrations/001 and the repository module
+is loaded against them.
+"""
+import asyncio
+import importlib.util
+import os
+import sys
+import types
+from contextlib import asynccontextmanager
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import StaticPool
+
+Base = declarative_base()
+
+class Account(Base):
+    __tablename__ = "accounts"
+    id = sa.Column(sa.Integer, primary_key=True)
+    account_number = sa.Column(sa.String(64), nullable=False, unique=True)
+    balance = sa.Column(sa.Numeric(19, 4), nullable=False)
+    currency = sa.Column(sa.String(8), nullable=False, server_default="USD")
+    owner_id = sa.Column(sa.Integer, nullable=False)
+    account_type = sa.Column(sa.String(32), nullable=False)
+    status = sa.Column(sa.String(16), nullable=False, server_default="active")
+    created_at = sa.Column(sa.DateTime, nullable=False, server_default=func.now())
+    updated_at = sa.Column(sa.DateTime, nullable=False, server_default=func.now())
+    meta = sa.Column("metadata", sa.JSON, key="metadata")
+
+class Transaction(Base):
+    __tablename__ = "transactions"
+    id = sa.Column(sa.Integer, primary_key=True)
+    transaction_ref = sa.Column(sa.String(64), nullable=False, unique=True)
+    source_account_id = sa.Column(sa.Integer, sa.ForeignKey("accounts.id"))
+    destination_account_id = sa.Column(sa.Integer, sa.ForeignKey("accounts.id"))
+    amount = sa.Column(sa.Numeric(19, 4), nullable=False)
+    currency = sa.Column(sa.String(8), nullable=False)
+    transaction_type = sa.Column(sa.String(32), nullable=False)
+    status = sa.Column(sa.String(16), nullable=False)
+    description = sa.Column(sa.String(255))
+    created_at = sa.Column(sa.DateTime, nullable=False, server_default=func.now())
+    updated_at = sa.Column(sa.DateTime, nullable=False, server_default=func.now())
+    meta = sa.Column("metadata", sa.JSON, key="metadata")
+
+class AuditLog(Base):
+    __tablename__ = "audit_log"
+    id = sa.Column(sa.Integer, primary_key=True)
+    action = sa.Column(sa.String(64), nullable=False)
+    entity_type = sa.Column(sa.String(64), nullable=False)
+    entity_id = sa.Column(sa.String(64), nullable=False)
+    actor_id = sa.Column(sa.Integer)
+    actor_type = sa.Column(sa.String(32), nullable=False)
+    timestamp = sa.Column(sa.DateTime, nullable=False, server_default=func.now())
+    ip_address = sa.Column(sa.String(64))
+    details = sa.Column(sa.JSON)
+
+def _load_repository_module():
+    """Import db_repository as part of a package whose models are the tables above"""
+    plugin_dir = os.path.join(os.path.dirname(__file__), "..", "plugins", "financial_business")
+    package = types.ModuleType("financial_business_under_test")
+    package.__path__ = [plugin_dir]
+    models = types.ModuleType("financial_business_under_test.models")
+    models.Account, models.Transaction, models.AuditLog = Account, Transaction, AuditLog
+    package.models = models
+    sys.modules[package.__name__] = package
+    sys.modules[models.__name__] = models
+
+    spec = importlib.util.spec_from_file_location(
+        "financial_business_under_test.db_repository", os.path.join(plugin_dir, "db_repository.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+db_repository = _load_repository_module()
+
+@asynccontextmanager
+async def open_repository(*balances):
+    """Repository on a fresh in-memory database with one account per balance (ids from 1)"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(sa.insert(Account), [
+            {"id": i, "account_number": f"ACC{i}", "balance": balance, "owner_id": i, "account_type": "checking"}
+            for i, balance in enumerate(balances, 1)
+        ])
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            yield db_repository.FinancialBusinessRepository(session), engine
+    finally:
+        await engine.dispose()
+
+async def get_balances(engine):
+    async with engine.connect() as conn:
+        rows = await conn.execute(select(Account.id, Account.balance).order_by(Account.id))
+        return [balance for _, balance in rows]
+
+async def count_rows(engine, model):
+    async with engine.connect() as conn:
+        return await conn.scalar(select(func.count()).select_from(model))
+
+def transaction(transaction_type, source=None, destination=None, amount=10):
+    return {
+        "source_account_id": source,
+        "destination_account_id": destination,
+        "amount": amount,
+        "currency": "USD",
+        "transaction_type": transaction_type
+    }
+
+class TestTransfers:
+    """Tests for transfers between accounts"""
+
+    def test_transfer_moves_funds_and_audits(self):
+        """Test a transfer debits, credits and audits in one commit"""
+        async def scenario():
+            async with open_repository(100, 0) as (repo, engine):
+                result = await repo.create_transaction(transaction("transfer", 1, 2, 30))
+
+                assert result["status"] == "completed"
+                assert await get_balances(engine) == [Decimal("70"), Decimal("30")]
+                assert await count_rows(engine, Transaction) == 1
+                assert await count_rows(engine, AuditLog) == 1
+
+        asyncio.run(scenario())
+
+    def test_overdraft_is_rejected(self):
+        """Test a transfer larger than the balance changes nothing"""
+        async def scenario():
+            async with open_repository(20, 0) as (repo, engine):
+                with pytest.raises(ValueError, match="Insufficient funds in account 1"):
+                    await repo.create_transaction(transaction("transfer", 1, 2, 50))
+
+                assert await get_balances(engine) == [Decimal("20"), Decimal("0")]
+                assert await count_rows(engine, Transaction) == 0
+                assert await count_rows(engine, AuditLog) == 0
+
+        asyncio.run(scenario())
+
+    def test_missing_destination_rolls_back_debit(self):
+        """Test the source is not debited when the destination doesn't exist"""
+        async def scenario():
+            async with open_repository(100) as (repo, engine):
+                with pytest.raises(ValueError, match="Destination account 99 not found"):
+                    await repo.create_transaction(transaction("transfer", 1, 99, 10))
+
+                assert await get_balances(engine) == [Decimal("100")]
+
+        asyncio.run(scenario())
+
+    def test_missing_source_is_reported(self):
+        """Test a transfer from an unknown account names that account"""
+        async def scenario():
+            async with open_repository(100) as (repo, engine):
+                with pytest.raises(ValueError, match="Source account 99 not found"):
+                    await repo.create_transaction(transaction("transfer", 99, 1, 10))
+
+                assert await get_balances(engine) == [Decimal("100")]
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize("source,destination", [(1, 2), (2, 1)])
+    def test_accounts_are_updated_in_id_order(self, source, destination):
+        """Test both balance updates lock the lower account id first"""
+        async def scenario():
+            async with open_repository(100, 100) as (repo, engine):
+                updated = []
+
+                def record(conn, cursor, statement, parameters, context, executemany):
+                    if statement.startswith("UPDATE accounts"):
+                        updated.append(next(p for p in parameters if p in (1, 2)))
+
+                event.listen(engine.sync_engine, "before_cursor_execute", record)
+                await repo.create_transaction(transaction("transfer", source, destination, 10))
+
+                assert updated == [1, 2]
+                balances = await get_balances(engine)
+                assert balances[source - 1] == Decimal("90")
+                assert balances[destination - 1] == Decimal("110")
+
+        asyncio.run(scenario())
+
+class TestDepositsAndWithdrawals:
+    """Tests for single-account transaction types"""
+
+    def test_deposit_credits_account(self):
+        """Test a deposit credits its destination"""
+        async def scenario():
+            async with open_repository(5) as (repo, engine):
+                result = await repo.create_transaction(transaction("deposit", destination=1, amount=7))
+
+                assert result["status"] == "completed"
+                assert await get_balances(engine) == [Decimal("12")]
+                assert await count_rows(engine, AuditLog) == 1
+
+        asyncio.run(scenario())
+
+    def test_deposit_into_missing_account_is_rejected(self):
+        """Test a deposit into an unknown account writes nothing"""
+        async def scenario():
+            async with open_repository(5) as (repo, engine):
+                with pytest.raises(ValueError, match="Destination account 99 not found"):
+                    await repo.create_transaction(transaction("deposit", destination=99))
+
+                assert await count_rows(engine, Transaction) == 0
+
+        asyncio.run(scenario())
+
+    def test_withdrawal_debits_account(self):
+        """Test a withdrawal debits its source"""
+        async def scenario():
+            async with open_repository(50) as (repo, engine):
+                result = await repo.create_transaction(transaction("withdrawal", source=1, amount=20))
+
+                assert result["status"] == "completed"
+                assert await get_balances(engine) == [Decimal("30")]
+
+        asyncio.run(scenario())
+
+    def test_overdrawn_withdrawal_is_rejected(self):
+        """Test a withdrawal larger than the balance changes nothing"""
+        async def scenario():
+            async with open_repository(10) as (repo, engine):
+                with pytest.raises(ValueError, match="Insufficient funds in account 1"):
+                    await repo.create_transaction(transaction("withdrawal", source=1, amount=20))
+
+                assert await get_balances(engine) == [Decimal("10")]
+                assert await count_rows(engine, Transaction) == 0
+
+        asyncio.run(scenario())
+
+    def test_unhandled_type_is_recorded_without_moving_funds(self):
+        """Test a type without a handler is stored as pending"""
+        async def scenario():
+            async with open_repository(10, 10) as (repo, engine):
+                result = await repo.create_transaction(transaction("adjustment", 1, 2, 5))
+
+                assert result["status"] == "pending"
+                assert await get_balances(engine) == [Decimal("10"), Decimal("10")]
+
+        asyncio.run(scenario())
+
+class TestAccountTransactionListing:
+    """Tests for listing an account's transactions"""
+
+    def test_both_sides_are_merged_newest_first(self):
+        """Test sent and received transactions are paged together by recency"""
+        async def scenario():
+            async with open_repository(100, 100, 100) as (repo, engine):
+                async with engine.begin() as conn:
+                    await conn.execute(sa.insert(Transaction), [
+                        {"id": i, "transaction_ref": f"TX{i}", "source_account_id": source,
+                         "destination_account_id": destination, "amount": 1, "currency": "USD",
+                         "transaction_type": "transfer", "status": "completed",
+                         "created_at": datetime(2024, 1, 1, 0, i)}
+                        for i, (source, destination) in enumerate(
+                            [(1, 2), (2, 1), (3, 2), (1, 1), (3, 1), (1, 3)], 1)
+                    ])
+
+                first = await repo.list_account_transactions(1, limit=3)
+                second = await repo.list_account_transactions(1, limit=3, offset=3)
+
+                assert [t["id"] for t in first] == [6, 5, 4]
+                assert [t["id"] for t in second] == [2, 1]
+
+        asyncio.run(scenario())
@@ -0,0 +1,206 @@
+"""
+Unit tests for the API gateway's rate limiting and realtime dispatch
+"""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from fastapi import HTTPException
+
+import gateway
+
+class FakeWebSocket:
+    """Records forwarded payloads, optionally after a delay"""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.sent = []
+
+    async def send_bytes(self, data):
+        await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+def make_connection(connection_id, roles=(), delay=0):
+    return gateway.WSConnection(
+        websocket=FakeWebSocket(delay),
+        connection_id=connection_id,
+        connected_at=0.0,
+        roles=tuple(roles),
+        last_activity=0.0
+    )
+
+def pmessage(channel: str, data: bytes = b"payload"):
+    return {"type": "pmessage", "channel": channel.encode(), "data": data}
+
+@pytest.fixture
+def connections():
+    """Start every test with no connected sockets"""
+    with patch.dict(gateway.active_ws_connections, clear=True):
+        yield gateway.active_ws_connections
+
+@pytest.fixture
+def mock_redis():
+    """Replace the async Redis client used for channel authorization"""
+    with patch("gateway.async_redis_client") as client:
+        client.get = AsyncMock(return_value=None)
+        client.setex = AsyncMock()
+        client.delete = AsyncMock()
+        yield client
+
+class TestRateLimiter:
+    """Tests for the sliding-window rate limiter"""
+
+    def test_allows_requests_within_limit(self):
+        """Test an allowed request reports the role limit and current count"""
+        with patch("gateway.sliding_window_script", MagicMock(return_value=[1, 3, 0])) as script:
+            assert gateway.rate_limiter("42", "user") == (gateway.RATE_LIMITS["user"], 3)
+
+        assert script.call_args.kwargs["keys"] == ["ratelimit:user:42"]
+
+    def test_rejects_with_retry_after(self):
+        """Test a rejected request gets a 429 with the seconds until a slot frees up"""
+        now_ms = 1_000_000_000
+        oldest_ms = now_ms - gateway.RATE_LIMIT_WINDOW_MS + 1500
+        with patch("gateway.time.time", return_value=now_ms / 1000), \
+             patch("gateway.sliding_window_script", MagicMock(return_value=[0, 100, oldest_ms])):
+            with pytest.raises(HTTPException) as exc_info:
+                gateway.rate_limiter("42", "user")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.headers == {"Retry-After": "2"}
+
+class TestRealtimeDispatch:
+    """Tests for routing realtime Redis messages to WebSockets"""
+
+    @pytest.mark.asyncio
+    async def test_user_message_reaches_only_that_user(self, connections):
+        """Test a user channel message is sent to that user's socket alone"""
+        connections["42"] = make_connection("a")
+        connections["7"] = make_connection("b")
+
+        await gateway._dispatch_realtime_message(pmessage("user:42:realtime"))
+
+        assert connections["42"].websocket.sent == [b"payload"]
+        assert connections["7"].websocket.sent == []
+
+    @pytest.mark.asyncio
+    async def test_role_broadcast_reaches_every_member(self, connections):
+        """Test a role channel message is sent to every socket holding the role"""
+        connections["1"] = make_connection("a", roles=("admin",))
+        connections["2"] = make_connection("b", roles=("admin", "user"))
+        connections["3"] = make_connection("c", roles=("user",))
+
+        await gateway._dispatch_realtime_message(pmessage("role:admin:broadcasts"))
+
+        assert connections["1"].websocket.sent == [b"payload"]
+        assert connections["2"].websocket.sent == [b"payload"]
+        assert connections["3"].websocket.sent == []
+
+    @pytest.mark.asyncio
+    async def test_slow_socket_does_not_delay_others(self, connections):
+        """Test a stalled client is timed out while the others still receive"""
+        connections["1"] = make_connection("slow", roles=("admin",), delay=10)
+        connections["2"] = make_connection("fast", roles=("admin",))
+
+        start = time.monotonic()
+        with patch("gateway.REALTIME_SEND_TIMEOUT", 0.05):
+            await gateway._dispatch_realtime_message(pmessage("role:admin:broadcasts"))
+
+        assert time.monotonic() - start < 1
+        assert connections["1"].websocket.sent == []
+        assert connections["2"].websocket.sent == [b"payload"]
+
+    @pytest.mark.asyncio
+    async def test_acl_message_drops_cached_authorization(self, connections, mock_redis):
+        """Test an ACL channel message invalidates the cached channel join"""
+        await gateway._dispatch_realtime_message(pmessage("user:42:acl", b"general"))
+
+        mock_redis.delete.assert_called_once_with("chanauth:42:general")
+
+    @pytest.mark.asyncio
+    async def test_dispatcher_reconnects_after_failure(self, connections):
+        """Test the dispatcher resubscribes after Redis drops and keeps delivering"""
+        connections["42"] = make_connection("a")
+        delivered = asyncio.Event()
+
+        class FakePubSub:
+            attempts = 0
+
+            def __init__(self):
+                FakePubSub.attempts += 1
+                self.attempt = FakePubSub.attempts
+
+            async def psubscribe(self, *patterns):
+                if self.attempt == 1:
+                    raise ConnectionError("connection refused")
+
+            async def listen(self):
+                yield pmessage("user:42:realtime")
+                delivered.set()
+                await asyncio.sleep(10)
+
+            async def close(self):
+                pass
+
+        with patch("gateway.async_redis_client") as client, \
+             patch("gateway.PUBSUB_RECONNECT_MIN", 0.01):
+            client.pubsub = FakePubSub
+            task = asyncio.create_task(gateway._pubsub_dispatcher())
+            await asyncio.wait_for(delivered.wait(), 1)
+            task.cancel()
+
+        assert FakePubSub.attempts == 2
+        assert connections["42"].websocket.sent == [b"payload"]
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_running_dispatcher(self):
+        """Test the lifespan hooks start the dispatcher and cancel it on shutdown"""
+        with patch("gateway._pubsub_dispatcher", lambda: asyncio.sleep(10)):
+            gateway.start_pubsub_dispatcher()
+            task = gateway._pubsub_task
+            await gateway.stop_pubsub_dispatcher()
+
+        assert task.cancelled()
+        assert gateway._pubsub_task is None
+
+class TestChannelAuthorization:
+    """Tests for the cached channel join authorization"""
+
+    @pytest.mark.asyncio
+    async def test_cached_result_skips_database(self, mock_redis):
+        """Test a cached authorization is returned without opening a session"""
+        mock_redis.get.return_value = b"1"
+        with patch("gateway.AsyncSessionLocal") as session_factory, \
+             patch("gateway._check_channel_membership", AsyncMock()) as check:
+            assert await gateway.is_user_authorized_for_channel("42", "general") is True
+
+        session_factory.assert_not_called()
+        check.assert_not_called()
+        mock_redis.setex.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_stores_membership_result(self, mock_redis):
+        """Test an uncached authorization is checked once and cached"""
+        session = object()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+        with patch("gateway.AsyncSessionLocal", session_factory), \
+             patch("gateway._check_channel_membership", AsyncMock(return_value=False)) as check:
+            assert await gateway.is_user_authorized_for_channel("42", "general") is False
+
+        check.assert_called_once_with("42", "general", session)
+        mock_redis.setex.assert_called_once_with("chanauth:42:general", gateway.CHANNEL_AUTH_CACHE_TTL, b"0")
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_without_async_driver_uses_sync_session(self, mock_redis):
+        """Test a non-PostgreSQL database falls back to a sync session"""
+        session = object()
+        session_cm = MagicMock()
+        session_cm.return_value.__enter__.return_value = session
+        with patch("gateway.AsyncSessionLocal", None), \
+             patch("gateway.db_session", session_cm), \
+             patch("gateway._check_channel_membership", AsyncMock(return_value=True)) as check:
+            assert await gateway.is_user_authorized_for_channel("42", "general") is True
+
+        check.assert_called_once_with("42", "general", session)
@@ -3,19 +3,27 @@ Unit tests for the MCP Adapter
 """
 import pytest
 import json
+import asyncio
 from fastapi.testclient import TestClient
 from datetime import datetime
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from main import app
-from mcp_adapter import generate_context_id
+import orjson
+
+from mcp_adapter import (
+    generate_context_id, retrieve_context, _ctx_cache,
+    _estimated_size, _stream_prediction, _STREAM_THRESHOLD
+)
 
 client = TestClient(app)
 
 @pytest.fixture
 def mock_context_provider():
     """Mock the context provider for testing"""
-    with patch("mcp_adapter.context_provider") as mock_provider:
+    with patch("mcp_adapter.get_context_provider") as get_provider:
+        mock_provider = get_provider.return_value
+        
         # Set up AsyncMock methods
         mock_provider.store = AsyncMock()
         mock_provider.retrieve = AsyncMock()
@@ -25,6 +33,9 @@ def mock_context_provider():
         # Configure default return values
         mock_provider.retrieve.return_value = None
         
+        # Start every test with an empty context cache
+        _ctx_cache.clear()
+        
         yield mock_provider
 
 def test_generate_context_id():
@@ -40,6 +51,36 @@ def test_generate_context_id():
     current_date = datetime.now().strftime("%Y%m%d")
     assert current_date in parts[1]
 
+def test_retrieve_context_is_cached(mock_context_provider):
+    """Test repeat context reads are served from the local cache"""
+    mock_context_provider.retrieve.return_value = {"id": "cached-context"}
+    
+    first = asyncio.run(retrieve_context("cached-context"))
+    second = asyncio.run(retrieve_context("cached-context"))
+    
+    assert first == second == {"id": "cached-context"}
+    mock_context_provider.retrieve.assert_called_once_with("cached-context")
+
+def test_local_cache_bypassed_with_redis_cache(mock_context_provider):
+    """Test every read goes to the shared cache when Redis caching is enabled"""
+    mock_context_provider.retrieve.return_value = {"id": "shared-context"}
+    
+    with patch("mcp_adapter.settings.MCP_REDIS_CACHE_ENABLED", True):
+        asyncio.run(retrieve_context("shared-context"))
+        asyncio.run(retrieve_context("shared-context"))
+    
+    assert mock_context_provider.retrieve.call_count == 2
+    assert "shared-context" not in _ctx_cache
+
+def test_health_check_does_not_touch_provider(mock_context_provider):
+    """Test the liveness probe answers without provider I/O"""
+    response = client.get("/api/mcp/health")
+    
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+    mock_context_provider.store.assert_not_called()
+    mock_context_provider.retrieve.assert_not_called()
+
 class TestContextEndpoints:
     """Tests for context management endpoints"""
     
@@ -74,6 +115,22 @@ class TestContextEndpoints:
         # Verify mock called
         mock_context_provider.store.assert_called_once()
     
+    def test_create_document_context_keeps_declared_fields(self, mock_context_provider):
+        """Test a document context stores its declared fields and drops the rest"""
+        test_data = {
+            "context_type": "document",
+            "data": {"content": "Quarterly report", "type": "markdown", "internal_flag": True}
+        }
+        
+        response = client.post("/api/mcp/context", json=test_data)
+        
+        assert response.status_code == 200
+        stored = mock_context_provider.store.call_args.args[1]
+        assert stored["content"] == "Quarterly report"
+        assert stored["doc_type"] == "markdown"
+        assert stored["type"] == "document"
+        assert "internal_flag" not in stored
+    
     def test_update_context(self, mock_context_provider):
         """Test updating a context"""
         # Configure mock to return an existing context
@@ -115,6 +172,32 @@ class TestContextEndpoints:
         mock_context_provider.retrieve.assert_called_once_with(context_id)
         mock_context_provider.store.assert_called_once()
 
+    def test_update_context_with_metadata(self, mock_context_provider):
+        """Test updating a context and its metadata in a single store"""
+        context_id = "test-context-456"
+        mock_context_provider.retrieve.return_value = {
+            "id": context_id,
+            "type": "conversation",
+            "state": {"step": 1},
+            "metadata": {"created_at": "2025-06-03T12:00:00"}
+        }
+
+        update_data = {
+            "context_id": context_id,
+            "updates": {"state": {"active": True}},
+            "metadata": {"user_id": "test123"}
+        }
+
+        response = client.post("/api/mcp/context/update", json=update_data)
+
+        assert response.status_code == 200
+        updated = response.json()["updated_data"]
+        assert updated["state"] == {"step": 1, "active": True}
+        assert updated["metadata"] == {"created_at": "2025-06-03T12:00:00", "user_id": "test123"}
+
+        mock_context_provider.retrieve.assert_called_once_with(context_id)
+        mock_context_provider.store.assert_called_once_with(context_id, updated)
+
 class TestToolEndpoints:
     """Tests for tool invocation endpoints"""
     
@@ -177,6 +260,22 @@ class TestToolEndpoints:
             assert "result" in tool_result
             assert "sentiment" in tool_result["result"]
             assert tool_result["result"]["sentiment"] == "positive"
+    
+    def test_sentiment_analyzer_matches_whole_words(self, mock_context_provider):
+        """Test sentiment words are not matched inside other words"""
+        tool_data = {
+            "tool_name": "sentiment_analyzer",
+            "parameters": {
+                "text": "I dislike the goodness of this awful product."
+            }
+        }
+        
+        response = client.post("/api/mcp/tool-invoke", json=tool_data)
+        
+        assert response.status_code == 200
+        analysis = response.json()["result"]["result"]
+        assert analysis["sentiment"] == "negative"
+        assert analysis["details"] == {"positive_matches": 0, "negative_matches": 2}
 
 class TestModelEndpoints:
     """Tests for model endpoints"""
@@ -253,3 +352,40 @@ class TestModelEndpoints:
             assert result["prediction"]["id"] == prediction_id
             assert result["prediction"]["model_id"] == model_id
             assert "outputs" in result["prediction"]
+    
+    def test_predict_streams_large_outputs(self, mock_context_provider):
+        """Test large prediction outputs are streamed with the same body"""
+        model_id = "classification-test_model"
+        mock_context_provider.retrieve.side_effect = lambda cid: {"id": model_id} if cid == f"model-{model_id}" else None
+        
+        with patch("mcp_adapter._STREAM_THRESHOLD", 0):
+            response = client.post("/api/mcp/predict", json={"model_id": model_id, "inputs": {"text": "Hi"}})
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        result = response.json()
+        assert result["status"] == "success"
+        assert result["prediction"]["model_id"] == model_id
+        assert result["prediction"]["outputs"]["confidence"] == 0.95
+    
+    def test_stream_prediction_frames_large_outputs(self):
+        """Test outputs over the streaming threshold serialize to the full document"""
+        prediction = {
+            "id": "prediction-1",
+            "model_id": "classification-test_model",
+            "outputs": {f"label_{i}": "x" * 1024 for i in range(80)},
+            "metadata": {"duration_ms": 100}
+        }
+        assert _estimated_size(prediction["outputs"]) > _STREAM_THRESHOLD
+        
+        body = b"".join(_stream_prediction(prediction))
+        
+        assert orjson.loads(body) == {"status": "success", "prediction": prediction}
+    
+    def test_stream_prediction_without_other_keys(self):
+        """Test a prediction holding only outputs still streams valid JSON"""
+        prediction = {"outputs": {"result": "x" * (_STREAM_THRESHOLD + 1)}}
+        
+        body = b"".join(_stream_prediction(prediction))
+        
+        assert orjson.loads(body) == {"status": "success", "prediction": prediction}